@@ -2,11 +2,50 @@
 JobScraper-Portugal Core Module
 
 Este módulo contém as classes e funções principais do JobScraper.
+
+Os nomes são carregados no primeiro acesso: `from core import JobStorage`
+não importa Selenium, BeautifulSoup nem numpy, que só são carregados
+por quem usa o scraper ou a deduplicação.
 """
 
-from .scraper import JobScraper
-from .parser import JobParser
-from .utils import save_to_csv
+import importlib
+
+# O registo de métricas é importado já: o submódulo tem o mesmo nome que a
+# instância `metrics`, e um import tardio de core.metrics sobrepunha-se a ela
+from .metrics import MetricsRegistry, metrics
+
+# Nome exportado -> submódulo que o define
+_EXPORTS = {
+    'JobScraper': 'scraper',
+    'JobParser': 'parser',
+    'JobOffer': 'offer',
+    'JobDeduplicator': 'dedup',
+    'ClusterIndex': 'dedup',
+    'save_to_csv': 'utils',
+    'save_to_parquet': 'utils',
+    'JobStorage': 'storage',
+    'save_to_sqlite': 'storage',
+    'HtmlStore': 'html_store',
+    'SnapshotIndex': 'snapshot',
+    'StreamingStats': 'sketches',
+    'StageProfiler': 'profiling',
+    'profile_stage': 'profiling',
+    'normalize_pub_date': 'dates',
+    'parse_cutoff': 'dates',
+    'UrlFrontier': 'frontier',
+    'RefreshScheduler': 'scheduler',
+}
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-__all__ = ['JobScraper', 'JobParser', 'save_to_csv']
-__version__ = '1.0.0'
\ No newline at end of file
+__all__ = ['JobScraper', 'JobParser', 'JobOffer', 'JobDeduplicator', 'ClusterIndex', 'save_to_csv', 'save_to_parquet', 'JobStorage', 'save_to_sqlite', 'HtmlStore', 'SnapshotIndex', 'StreamingStats', 'MetricsRegistry', 'metrics', 'StageProfiler', 'profile_stage', 'normalize_pub_date', 'parse_cutoff', 'UrlFrontier', 'RefreshScheduler']
+__version__ = '1.0.0'
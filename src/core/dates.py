@@ -0,0 +1,111 @@
+import re
+from datetime import date, datetime, timedelta
+
+# Meses pelas três primeiras letras (português e inglês)
+MONTHS = {
+    "jan": 1, "fev": 2, "feb": 2, "mar": 3, "abr": 4, "apr": 4, "mai": 5, "may": 5,
+    "jun": 6, "jul": 7, "ago": 8, "aug": 8, "set": 9, "sep": 9, "out": 10, "oct": 10,
+    "nov": 11, "dez": 12, "dec": 12,
+}
+
+# Palavras com o número de dias decorridos
+RELATIVE_DAYS = {
+    "agora": 0, "hoje": 0, "now": 0, "today": 0,
+    "anteontem": 2, "ontem": 1, "yesterday": 1,
+}
+
+# Unidades das datas relativas ("há 3 dias", "2 weeks ago"); meses e anos aproximados
+RELATIVE_UNITS = {
+    "minuto": timedelta(minutes=1), "minute": timedelta(minutes=1), "min": timedelta(minutes=1),
+    "hora": timedelta(hours=1), "hour": timedelta(hours=1),
+    "dia": timedelta(days=1), "day": timedelta(days=1),
+    "semana": timedelta(weeks=1), "week": timedelta(weeks=1),
+    "mês": timedelta(days=30), "mes": timedelta(days=30), "month": timedelta(days=30),
+    "ano": timedelta(days=365), "year": timedelta(days=365),
+}
+ONE = {"um", "uma", "a", "an", "one"}
+
+ISO_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+NUMERIC_RE = re.compile(r"\b(\d{1,2})[./-](\d{1,2})[./-](\d{4})\b")
+RELATIVE_RE = re.compile(
+    r"\b(\d+|um|uma|an?|one)\s+(minutos?|minutes?|min|horas?|hours?|dias?|days?|semanas?|weeks?"
+    r"|m[eê]s|meses|months?|anos?|years?)\b"
+)
+TEXT_RE = re.compile(r"\b(\d{1,2})(?:\s+de)?\s+([a-zç]{3,})\.?(?:\s+(?:de\s+)?(\d{4}))?")
+WORD_RE = re.compile(r"[a-z]+")
+
+
+def _relative_unit(word):
+    word = "mês" if word == "meses" else word
+    return RELATIVE_UNITS.get(word) or RELATIVE_UNITS[word.rstrip("s")]
+
+
+def parse_pub_date(text, now=None):
+    """
+    Converte a data de publicação do site num `date`, ou None se não a
+    reconhecer. Aceita datas absolutas ("20 de Outubro de 2025",
+    "20/10/2025", "2025-10-20", "20 Out") e relativas a `now` ("hoje",
+    "ontem", "há 3 dias", "há uma semana", "2 hours ago").
+    """
+    if not text or text == "N/A":
+        return None
+    now = now or datetime.now()
+    text = str(text).strip().lower()
+
+    try:
+        match = ISO_RE.search(text)
+        if match:
+            year, month, day = map(int, match.groups())
+            return date(year, month, day)
+
+        match = NUMERIC_RE.search(text)
+        if match:
+            day, month, year = map(int, match.groups())
+            return date(year, month, day)
+    except ValueError:
+        return None
+
+    match = RELATIVE_RE.search(text)
+    if match:
+        amount, unit = match.groups()
+        count = 1 if amount in ONE else int(amount)
+        return (now - count * _relative_unit(unit)).date()
+
+    for word in WORD_RE.findall(text):
+        if word in RELATIVE_DAYS:
+            return (now - timedelta(days=RELATIVE_DAYS[word])).date()
+
+    for match in TEXT_RE.finditer(text):
+        day, month_name, year = match.groups()
+        month = MONTHS.get(month_name[:3])
+        if month is None:
+            continue
+        try:
+            if year:
+                return date(int(year), month, int(day))
+            # Sem ano: o mais recente que não fique no futuro
+            parsed = date(now.year, month, int(day))
+            if parsed > now.date() + timedelta(days=1):
+                parsed = parsed.replace(year=now.year - 1)
+            return parsed
+        except ValueError:
+            return None
+
+    return None
+
+
+def normalize_pub_date(text, now=None):
+    """Data de publicação em ISO (AAAA-MM-DD); o texto original se não for reconhecida."""
+    parsed = parse_pub_date(text, now)
+    return parsed.isoformat() if parsed else text
+
+
+def parse_cutoff(text, now=None):
+    """
+    Data limite de --since: ISO ou qualquer forma aceite por parse_pub_date
+    ("7 dias", "ontem"). Lança ValueError se não for reconhecida.
+    """
+    parsed = parse_pub_date(text, now)
+    if parsed is None:
+        raise ValueError(f"data inválida: {text!r} (use AAAA-MM-DD ou p. ex. '7 dias')")
+    return parsed
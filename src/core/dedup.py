@@ -0,0 +1,262 @@
+import hashlib
+import os
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+_SHIFT = np.uint64(32)
+_MAX_HASH = np.uint64(2 ** 32 - 1)
+# Multiplicador para combinar os hashes das palavras de um shingle
+_SHINGLE_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+
+class JobDeduplicator:
+    """
+    Deteção de ofertas quase duplicadas (repostadas com novo link ou
+    publicadas para várias cidades) com assinaturas MinHash sobre shingles
+    de título + descrição e LSH por bandas.
+
+    Cada oferta recebe um `cluster_id`; ofertas do mesmo cluster representam
+    a mesma posição. O id é um hash do menor link do cluster, pelo que não
+    depende da ordem das ofertas; com um ClusterIndex, os clusters que
+    coincidem com ofertas de runs anteriores herdam o id já atribuído. Com `bands` bandas de `rows` linhas, pares com
+    similaridade de Jaccard s são candidatos com probabilidade
+    1 - (1 - s^rows)^bands; os candidatos são depois confirmados pela
+    similaridade estimada (>= threshold).
+    """
+
+    def __init__(self, num_perm=64, bands=16, shingle_size=3, threshold=0.7,
+                 min_shingles=5, batch_size=500, seed=42):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm tem de ser múltiplo de bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+        self.batch_size = batch_size
+
+        # Hashing multiply-shift: h(x) = ((a*x + b) mod 2^64) >> 32, com a ímpar
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        """
+        Hashes dos shingles de `shingle_size` palavras do texto normalizado.
+        As palavras passam por crc32 e os shingles são combinados de forma
+        vetorizada.
+        """
+        words = re.findall(r"\w+", text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+
+        hashes = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+        k = min(self.shingle_size, len(hashes))
+        n = len(hashes) - k + 1
+        combined = hashes[:n].copy()
+        for offset in range(1, k):
+            combined = combined * _SHINGLE_MULT + hashes[offset:offset + n]
+        return np.unique(combined)
+
+    def _offer_text(self, offer):
+        title = offer.get("Título", "N/A")
+        description = offer.get("Descrição", "N/A")
+        parts = [str(v) for v in (title, description) if v and v != "N/A"]
+        return " ".join(parts)
+
+    def signatures(self, texts):
+        """
+        Matriz (n_textos x num_perm) de assinaturas MinHash.
+        Processa os textos em lotes, com todos os shingles do lote numa só
+        operação vetorizada (np.minimum.reduceat por oferta).
+        """
+        n = len(texts)
+        sigs = np.full((n, self.num_perm), _MAX_HASH, dtype=np.uint64)
+        valid = np.zeros(n, dtype=bool)
+
+        for start in range(0, n, self.batch_size):
+            batch = [self.shingles(t) for t in texts[start:start + self.batch_size]]
+            lengths = np.array([len(s) for s in batch])
+            keep = np.flatnonzero(lengths >= self.min_shingles)
+            if len(keep) == 0:
+                continue
+
+            hashes = np.concatenate([batch[i] for i in keep])
+            offsets = np.concatenate(([0], np.cumsum(lengths[keep])[:-1]))
+            permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> _SHIFT
+            sigs[start + keep] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            valid[start + keep] = True
+
+        return sigs, valid
+
+    @staticmethod
+    def cluster_label(key):
+        """Id estável de um cluster a partir da chave do seu representante."""
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()
+
+    def band_keys(self, sigs):
+        """
+        Matriz (n x bands) das chaves LSH: em cada banda, uma combinação
+        linear das suas linhas (overflow uint64 intencional).
+        """
+        rng = np.random.default_rng(0)
+        coef = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64)
+        keys = np.empty((len(sigs), self.bands), dtype=np.uint64)
+        for band in range(self.bands):
+            keys[:, band] = (sigs[:, band * self.rows:(band + 1) * self.rows] * coef).sum(axis=1)
+        return keys
+
+    def find_clusters(self, texts, keys=None):
+        """
+        Retorna, para cada texto, o id do seu cluster: o hash da menor chave
+        (`keys`, p. ex. os links; por omissão os próprios textos) do cluster.
+        """
+        return self._cluster(texts, keys)[0]
+
+    def _cluster(self, texts, keys=None):
+        """find_clusters que também retorna as assinaturas e as chaves LSH."""
+        n = len(texts)
+        sigs, valid = self.signatures(texts)
+        all_band_keys = self.band_keys(sigs)
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        candidates = np.flatnonzero(valid)
+        for band in range(self.bands):
+            band_keys = all_band_keys[candidates, band]
+            order = np.argsort(band_keys, kind="stable")
+            sorted_keys = band_keys[order]
+            same_as_prev = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1]) + 1
+
+            for pos in same_as_prev:
+                i = int(candidates[order[pos - 1]])
+                j = int(candidates[order[pos]])
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
+                similarity = np.mean(sigs[i] == sigs[j])
+                if similarity >= self.threshold:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        keys = texts if keys is None else keys
+        representative = {}
+        roots = [find(i) for i in range(n)]
+        for i, root in enumerate(roots):
+            if root not in representative or keys[i] < representative[root]:
+                representative[root] = keys[i]
+        labels = [self.cluster_label(representative[root]) for root in roots]
+        return labels, sigs, valid, all_band_keys
+
+    def assign_clusters(self, offers, index=None):
+        """
+        Marca cada oferta (JobOffer) com o seu cluster_id e retorna a lista.
+        Com um `index` (ClusterIndex), os clusters deste run que coincidem
+        com ofertas de runs anteriores herdam o cluster_id já atribuído.
+        """
+        texts = [self._offer_text(offer) for offer in offers]
+        # Chave do representante: o link (ou o texto, para ofertas sem link)
+        links = [offer.get("Link", "N/A") for offer in offers]
+        keys = [link if link != "N/A" else text for link, text in zip(links, texts)]
+        labels, sigs, valid, band_keys = self._cluster(texts, keys)
+
+        if index is not None:
+            labels = index.resolve(labels, links, sigs, valid, band_keys, self.threshold)
+        for offer, label in zip(offers, labels):
+            offer.cluster_id = label
+
+        duplicates = len(offers) - len(set(labels))
+        print(f"Deduplicação: {len(set(labels))} posições únicas ({duplicates} duplicados)")
+        return offers
+
+
+class ClusterIndex:
+    """
+    Índice LSH persistente, em tabelas do SQLite do histórico: a assinatura
+    MinHash e o cluster_id de cada link já agrupado, e as suas chaves de
+    banda. Uma oferta repostada num run posterior (com novo link) encontra
+    assim o cluster antigo e recebe o mesmo id, mesmo que o link
+    representativo já não esteja publicado.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS lsh_signatures (
+        link TEXT PRIMARY KEY,
+        cluster_id TEXT NOT NULL,
+        signature BLOB NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS lsh_bands (
+        band INTEGER NOT NULL,
+        key INTEGER NOT NULL,
+        link TEXT NOT NULL,
+        PRIMARY KEY (band, key, link)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path="data/jobs_itjobs.db"):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def candidates(self, band_keys):
+        """(link, cluster_id, assinatura) guardados que partilham alguma banda."""
+        # Chaves uint64 guardadas como INTEGER (int64 com sinal)
+        signed = band_keys.view(np.int64)
+        params = [value for band, key in enumerate(signed) for value in (band, int(key))]
+        placeholders = ",".join(["(?, ?)"] * len(signed))
+        rows = self.conn.execute(
+            "SELECT DISTINCT s.link, s.cluster_id, s.signature FROM lsh_bands b "
+            "JOIN lsh_signatures s ON s.link = b.link "
+            f"WHERE (b.band, b.key) IN (VALUES {placeholders})",
+            params,
+        )
+        return [(link, cluster_id, np.frombuffer(blob, dtype=np.uint64)) for link, cluster_id, blob in rows]
+
+    def resolve(self, labels, links, sigs, valid, band_keys, threshold):
+        """
+        Substitui cada label deste run pelo menor cluster_id guardado de uma
+        oferta semelhante (similaridade estimada >= threshold) e guarda as
+        ofertas do run com os ids finais. Retorna a nova lista de labels.
+        """
+        known = {}
+        for i in np.flatnonzero(valid):
+            for link, cluster_id, signature in self.candidates(band_keys[i]):
+                if link == links[i] or np.mean(signature == sigs[i]) >= threshold:
+                    known.setdefault(labels[i], set()).add(cluster_id)
+        resolved = [min(known[label]) if label in known else label for label in labels]
+
+        stored = [i for i in np.flatnonzero(valid) if links[i] != "N/A"]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO lsh_signatures (link, cluster_id, signature) VALUES (?, ?, ?)",
+                [(links[i], resolved[i], sigs[i].tobytes()) for i in stored],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO lsh_bands (band, key, link) VALUES (?, ?, ?)",
+                [(band, int(key), links[i])
+                 for i in stored for band, key in enumerate(band_keys[i].view(np.int64))],
+            )
+        return resolved
@@ -0,0 +1,230 @@
+import hashlib
+import heapq
+import math
+import os
+import sqlite3
+import struct
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Parâmetros de tracking removidos dos URLs (não mudam a página)
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Cabeçalho do ficheiro do filtro de Bloom: magic, nº de bits, nº de hashes e
+# marca do dono (no frontier, o maior rowid de seen.db quando foi guardado)
+BLOOM_HEADER = struct.Struct("<4sQIQ")
+BLOOM_MAGIC = b"BLM2"
+
+
+def canonicalize_url(href, base="https://www.itjobs.pt"):
+    """
+    Forma canónica de um link (relativo a `base`): esquema e host em
+    minúsculas, sem porta por omissão, fragmento nem parâmetros de tracking,
+    com a query ordenada e sem "/" final. Retorna None se não for http(s).
+    """
+    if not href:
+        return None
+    parts = urlsplit(urljoin(base + "/", href.strip()))
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom em `bytearray` com k hashes obtidos por double hashing
+    de um blake2b. Dimensionado para `capacity` elementos com taxa de falsos
+    positivos `error_rate` (1M URLs a 1%: ≈1.2 MB).
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.stamp = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.size, self.hashes, self.stamp))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Lê o filtro guardado, ou None se o ficheiro não existir ou for inválido."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            header = f.read(BLOOM_HEADER.size)
+            bits = f.read()
+        if len(header) != BLOOM_HEADER.size:
+            return None
+        magic, size, hashes, stamp = BLOOM_HEADER.unpack(header)
+        if magic != BLOOM_MAGIC or len(bits) != (size + 7) // 8:
+            return None
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hashes, bloom.bits, bloom.stamp = size, hashes, bytearray(bits), stamp
+        return bloom
+
+
+class UrlFrontier:
+    """
+    Fila dos URLs das ofertas a visitar, sem repetições e por prioridade:
+    primeiro as ofertas nunca vistas (NEW, pela ordem da listagem), depois
+    as visitadas há mais de `refresh_after` (STALE, as mais antigas
+    primeiro) e por fim as visitadas recentemente (FRESH).
+
+    Com `root`, o conjunto de URLs vistos persiste entre execuções: um
+    filtro de Bloom (seen.bloom) responde sem ir ao disco para os URLs
+    novos e uma tabela SQLite (seen.db) guarda, de forma exata, quando cada
+    URL foi visto e descarregado. Sem `root`, só evita repetições no run.
+    """
+
+    NEW, STALE, FRESH = 0, 1, 2
+
+    def __init__(self, root=None, refresh_after=timedelta(hours=24), capacity=1_000_000, error_rate=0.01):
+        self.root = root
+        self.refresh_after = refresh_after
+        self.queued = set()
+        self._heap = []
+        self._counter = 0
+        self.conn = None
+        self.bloom = None
+
+        if root:
+            os.makedirs(root, exist_ok=True)
+            self.bloom_path = os.path.join(root, "seen.bloom")
+            self.conn = sqlite3.connect(os.path.join(root, "seen.db"))
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen ("
+                "url TEXT PRIMARY KEY, first_seen TEXT NOT NULL, last_fetched TEXT, "
+                "fetches INTEGER NOT NULL DEFAULT 0)"
+            )
+            self.conn.commit()
+            self.bloom = BloomFilter.load(self.bloom_path)
+            if self.bloom is None or self.bloom.stamp != self._table_stamp():
+                # Sem filtro, corrompido ou desatualizado (o processo terminou sem
+                # close()): reconstrói-o a partir da tabela exata
+                self.bloom = BloomFilter(capacity, error_rate)
+                for (url,) in self.conn.execute("SELECT url FROM seen"):
+                    self.bloom.add(url)
+
+    def _table_stamp(self):
+        """Maior rowid de seen.db: muda sempre que entra um URL (as linhas nunca são apagadas)."""
+        return self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM seen").fetchone()[0]
+
+    def reset(self):
+        """Esvazia a fila e esquece os URLs agendados (novo run); o conjunto persistente mantém-se."""
+        self.queued.clear()
+        self._heap.clear()
+
+    def seen(self, url):
+        """True se o URL está no conjunto persistente (sem `root`, sempre False)."""
+        return self._lookup(url)[0]
+
+    def _lookup(self, url):
+        """(visto antes, último download) segundo o conjunto persistente."""
+        if self.conn is None or url not in self.bloom:
+            return False, None
+        row = self.conn.execute("SELECT last_fetched FROM seen WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False, None  # falso positivo do filtro de Bloom
+        return True, row[0]
+
+    def add(self, url):
+        """
+        Agenda o URL (já canónico). Retorna a prioridade atribuída, ou None
+        se o URL já estava agendado neste run.
+        """
+        if url in self.queued:
+            return None
+        self.queued.add(url)
+
+        seen, last_fetched = self._lookup(url)
+        if not seen:
+            priority, order = self.NEW, ""
+        elif last_fetched is None or \
+                datetime.fromisoformat(last_fetched) < datetime.now() - self.refresh_after:
+            priority, order = self.STALE, last_fetched or ""
+        else:
+            priority, order = self.FRESH, ""
+
+        if not seen and self.conn is not None:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO seen (url, first_seen) VALUES (?, ?)",
+                    (url, datetime.now().isoformat(timespec="seconds")),
+                )
+            self.bloom.add(url)
+
+        heapq.heappush(self._heap, (priority, order, self._counter, url))
+        self._counter += 1
+        return priority
+
+    def pop(self):
+        """(url, prioridade) seguinte, ou None se a fila está vazia."""
+        if not self._heap:
+            return None
+        priority, _, _, url = heapq.heappop(self._heap)
+        return url, priority
+
+    def __len__(self):
+        return len(self._heap)
+
+    def drain(self):
+        """Esvazia a fila por ordem de prioridade."""
+        while self._heap:
+            yield self.pop()
+
+    def mark_fetched(self, url, when=None):
+        """Regista o download do URL (passa a FRESH durante `refresh_after`)."""
+        if self.conn is None:
+            return
+        when = when or datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO seen (url, first_seen, last_fetched, fetches) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT(url) DO UPDATE SET last_fetched = excluded.last_fetched, fetches = fetches + 1",
+                (url, when, when),
+            )
+        self.bloom.add(url)
+
+    def close(self):
+        """Guarda o filtro de Bloom e fecha a tabela."""
+        if self.conn is not None:
+            self.bloom.stamp = self._table_stamp()
+            self.bloom.save(self.bloom_path)
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+from collections.abc import Sequence
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class HtmlStore:
+    """
+    Armazenamento endereçado por conteúdo do HTML descarregado.
+    Cada página é guardada comprimida (zstd se disponível, senão gzip) em
+    objects/<sha256[:2]>/<sha256>, pelo que páginas idênticas ocupam espaço
+    uma única vez. Um índice SQLite associa cada URL ao hash mais recente.
+    """
+
+    def __init__(self, root="data/html_store"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(os.path.join(root, "index.db"))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, digest TEXT NOT NULL, fetched_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+        if zstandard is not None:
+            self._compressor = zstandard.ZstdCompressor(level=10)
+            self._decompressor = zstandard.ZstdDecompressor()
+            self.extension = ".zst"
+        else:
+            self.extension = ".gz"
+
+    def _path(self, digest, extension=None):
+        return os.path.join(self.objects_dir, digest[:2], digest + (extension or self.extension))
+
+    def _compress(self, data):
+        if zstandard is not None:
+            return self._compressor.compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def put(self, url, html):
+        """Guarda o HTML (se ainda não existir) e associa-o ao URL. Retorna o hash."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        if not self.has(digest):
+            path = self._path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self._compress(data))
+            os.replace(tmp_path, path)
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO pages (url, digest, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET digest = excluded.digest, fetched_at = excluded.fetched_at",
+                (url, digest, datetime.now().isoformat(timespec="seconds"))
+            )
+        return digest
+
+    def has(self, digest):
+        return any(os.path.exists(self._path(digest, ext)) for ext in (".zst", ".gz"))
+
+    def get(self, digest):
+        """Lê e descomprime o HTML com o hash dado."""
+        zst_path = self._path(digest, ".zst")
+        if os.path.exists(zst_path):
+            if zstandard is None:
+                raise RuntimeError("zstandard não está instalado - não é possível ler " + zst_path)
+            with open(zst_path, "rb") as f:
+                return self._decompressor.decompress(f.read()).decode("utf-8")
+
+        with open(self._path(digest, ".gz"), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+
+    def digest_for(self, url):
+        row = self.conn.execute("SELECT digest FROM pages WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def get_url(self, url):
+        """HTML mais recente guardado para o URL, ou None."""
+        digest = self.digest_for(url)
+        return self.get(digest) if digest else None
+
+    def urls(self, prefix=""):
+        """URLs guardados (opcionalmente filtrados por prefixo)."""
+        rows = self.conn.execute(
+            "SELECT url FROM pages WHERE url LIKE ? ORDER BY url", (prefix + "%",)
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        """Fecha o índice SQLite."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class StoredPages(Sequence):
+    """
+    Lista de páginas guardadas no HtmlStore, lida sob pedido: apenas os
+    hashes ficam em memória e o HTML é descomprimido ao aceder a cada página.
+    """
+
+    def __init__(self, store, digests):
+        self.store = store
+        self.digests = list(digests)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StoredPages(self.store, self.digests[index])
+        return self.store.get(self.digests[index])
+
+    def __len__(self):
+        return len(self.digests)
@@ -0,0 +1,216 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Limites (segundos) dos buckets de latência: de classificadores (µs) a páginas (s)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIX = "jobscraper"
+
+
+class Histogram:
+    """Histograma de latências com buckets fixos (contagens não cumulativas)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """[(limite, contagem acumulada)], terminando em +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + [float("inf")], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class MetricsRegistry:
+    """
+    Métricas do pipeline: contadores e histogramas de duração por etapa
+    (label `stage`). Exporta em JSON e no formato de texto do Prometheus,
+    no fim do run ou em direto num porto local (serve).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = Histogram(self.buckets)
+            self.histograms[stage].observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        """Mede a duração do bloco e regista-a no histograma da etapa."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorador: mede cada chamada da função na etapa `stage`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(stage, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started_at = datetime.now()
+
+    def to_dict(self):
+        with self._lock:
+            counters = {}
+            for (name, labels), value in sorted(self.counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+            stages = {}
+            for stage, hist in sorted(self.histograms.items()):
+                stages[stage] = {
+                    "count": hist.count,
+                    "total_seconds": round(hist.sum, 6),
+                    "mean_seconds": round(hist.sum / hist.count, 6) if hist.count else 0.0,
+                    "per_second": round(hist.count / hist.sum, 3) if hist.sum else None,
+                    "buckets": {_format_bound(bound): n for bound, n in hist.cumulative()},
+                }
+
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "counters": counters,
+            "stages": stages,
+        }
+
+    def to_prometheus(self):
+        """Texto no formato de exposição do Prometheus."""
+        lines = []
+        with self._lock:
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                metric = f"{PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for (counter_name, labels), value in sorted(self.counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+            if self.histograms:
+                metric = f"{PREFIX}_stage_duration_seconds"
+                lines.append(f"# HELP {metric} Duração de cada etapa do pipeline.")
+                lines.append(f"# TYPE {metric} histogram")
+                for stage, hist in sorted(self.histograms.items()):
+                    for bound, n in hist.cumulative():
+                        labels = _format_labels([("stage", stage), ("le", _format_bound(bound))])
+                        lines.append(f"{metric}_bucket{labels} {n}")
+                    labels = _format_labels([("stage", stage)])
+                    lines.append(f"{metric}_sum{labels} {hist.sum!r}")
+                    lines.append(f"{metric}_count{labels} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory="data/metrics"):
+        """Escreve metrics.json e metrics.prom na pasta. Retorna os dois caminhos."""
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, "metrics.json")
+        prom_path = os.path.join(directory, "metrics.prom")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        with open(prom_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        print(f"Métricas guardadas em {json_path} e {prom_path}")
+        return json_path, prom_path
+
+    def summary(self):
+        """Linhas legíveis com o tempo total e o débito de cada etapa."""
+        lines = []
+        for stage, data in self.to_dict()["stages"].items():
+            rate = f", {data['per_second']:.1f}/s" if data["per_second"] else ""
+            lines.append(f"   • {stage}: {data['count']} × {data['mean_seconds'] * 1000:.2f} ms "
+                         f"= {data['total_seconds']:.2f} s{rate}")
+        return lines
+
+    def serve(self, port=9108, host="127.0.0.1"):
+        """Expõe /metrics (Prometheus) e /metrics.json num servidor HTTP em segundo plano."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics.json":
+                    body = json.dumps(registry.to_dict(), ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json"
+                elif self.path in ("/", "/metrics"):
+                    body = registry.to_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"Métricas disponíveis em http://{host}:{port}/metrics")
+        return self._server
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Registo partilhado por todo o pipeline
+metrics = MetricsRegistry()
@@ -0,0 +1,87 @@
+from collections.abc import Mapping
+
+# (atributo, coluna CSV, elemento XML) de cada campo de uma oferta
+FIELDS = [
+    ("title", "Título", "titulo"),
+    ("company", "Empresa", "empresa"),
+    ("location", "Localização", "localizacao"),
+    ("contract_type", "Tipo de contrato", "tipo_contrato"),
+    ("seniority", "Seniority", "seniority"),
+    ("technologies", "Tecnologias", "tecnologias"),
+    ("description", "Descrição", "descricao"),
+    ("link", "Link", "link"),
+    ("pub_date", "Data de publicação", "data_publicacao"),
+    ("mode", "Modo de trabalho", "modo_trabalho"),
+    ("category", "Categoria", "categoria"),
+    # Cluster de quase-duplicados (JobDeduplicator); não existe no XML
+    ("cluster_id", "Cluster", None),
+]
+
+ATTRIBUTES = tuple(attr for attr, _, _ in FIELDS)
+CSV_COLUMNS = tuple(column for _, column, _ in FIELDS)
+CSV_TO_ATTR = {column: attr for attr, column, _ in FIELDS}
+
+# Ordem dos elementos definida em OfertaType (jobs_schema.xsd)
+XML_ORDER = [
+    "titulo", "empresa", "localizacao", "tecnologias", "seniority", "categoria",
+    "tipo_contrato", "modo_trabalho", "data_publicacao", "descricao", "link"
+]
+XML_TO_CSV = {tag: column for _, column, tag in FIELDS if tag}
+# (elemento XML, coluna CSV) de cada <oferta>, usados pelo conversor csv_to_xml
+XML_FIELDS = [(tag, XML_TO_CSV[tag]) for tag in XML_ORDER]
+
+
+class JobOffer(Mapping):
+    """
+    Registo compacto de uma oferta (com __slots__, sem dict por instância).
+    Funciona como mapping só de leitura com as chaves do CSV, pelo que pode
+    ser usado diretamente onde antes se usava o dict do JobParser.
+    """
+
+    __slots__ = ATTRIBUTES
+
+    def __init__(self, title="N/A", company="N/A", location="N/A", contract_type="N/A",
+                 seniority="N/A", technologies="N/A", description="N/A", link="N/A",
+                 pub_date="N/A", mode="N/A", category="N/A", cluster_id="N/A"):
+        self.title = title
+        self.company = company
+        self.location = location
+        self.contract_type = contract_type
+        self.seniority = seniority
+        self.technologies = technologies
+        self.description = description
+        self.link = link
+        self.pub_date = pub_date
+        self.mode = mode
+        self.category = category
+        self.cluster_id = cluster_id
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Cria a oferta a partir de um dict com as chaves do scraper (title, company, ...)."""
+        return cls(**{attr: raw.get(attr, "N/A") for attr in ATTRIBUTES})
+
+    # Interface Mapping (chaves do CSV)
+    def __getitem__(self, key):
+        try:
+            return getattr(self, CSV_TO_ATTR[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(CSV_COLUMNS)
+
+    def __len__(self):
+        return len(CSV_COLUMNS)
+
+    def __repr__(self):
+        return f"JobOffer(title={self.title!r}, company={self.company!r}, link={self.link!r})"
+
+    # Serializadores
+    def to_csv_row(self):
+        """Linha para o CSV (colunas em português)."""
+        return {column: getattr(self, attr) for attr, column, _ in FIELDS}
+
+    def to_db_record(self):
+        """Registo para a tabela offers do SQLite (colunas = atributos)."""
+        return {attr: getattr(self, attr) for attr in ATTRIBUTES}
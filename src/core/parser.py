@@ -1,26 +1,22 @@
+from .offer import JobOffer
+from .metrics import metrics
+
 class JobParser:
+    @metrics.timed("parse_jobs")
     def parse_jobs(self, raw_jobs):
         """
         Organiza os dados extraídos pelo scraper e garante consistência
         nas chaves para o CSV final.
+        As ofertas JobOffer já expõem as chaves do CSV e são devolvidas sem cópia;
+        dicts antigos (chaves do scraper) são convertidos para JobOffer.
         """
         parsed = []
 
         for job in raw_jobs:
             try:
-                parsed.append({
-                    "Título": job.get("title", "N/A"),
-                    "Empresa": job.get("company", "N/A"),
-                    "Localização": job.get("location", "N/A"),
-                    "Tipo de contrato": job.get("contract_type", "N/A"),
-                    "Seniority": job.get("seniority", "N/A"),
-                    "Tecnologias": job.get("technologies", "N/A"),
-                    "Descrição": job.get("description", "N/A"),
-                    "Link": job.get("link", "N/A"),
-                    "Data de publicação": job.get("pub_date", "N/A"),
-                    "Modo de trabalho": job.get("mode", "N/A"),
-                    "Categoria": job.get("category", "N/A")
-                })
+                if not isinstance(job, JobOffer):
+                    job = JobOffer.from_raw(job)
+                parsed.append(job)
             except Exception as e:
                 print(f"Erro ao analisar oferta: {e}")
 
@@ -0,0 +1,168 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PROFILE_MODES = ("stages", "sample")
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StageProfiler:
+    """
+    Perfis por etapa do pipeline, guardados em <output_dir>/<run>/.
+
+    Modo "stages": cada etapa corre sob cProfile e tracemalloc e gera
+    <etapa>.prof (abrir com pstats ou snakeviz), <etapa>_top.txt (funções
+    com mais tempo acumulado) e <etapa>_alloc.txt (linhas que mais memória
+    alocaram e pico da etapa). Tem custo elevado; serve para investigar.
+
+    Modo "sample": uma thread recolhe a pilha da thread principal a cada
+    `interval` segundos (custo baixo, pode ficar ligado em produção) e no
+    fim escreve samples.folded (formato flamegraph, prefixado pela etapa)
+    e samples_top.txt.
+    """
+
+    def __init__(self, output_dir="data/profiles", mode="stages", interval=0.01, top=30):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"modo de profiling desconhecido: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.top = top
+        self.output_dir = os.path.join(output_dir, datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self.current_stage = "-"
+        self.samples = Counter()
+        self._thread = None
+        self._stop = threading.Event()
+        self._target = None
+
+    # Modo "stages"
+    @contextmanager
+    def stage(self, name):
+        """Perfila o bloco como a etapa `name`."""
+        previous = self.current_stage
+        self.current_stage = name
+        try:
+            if self.mode == "sample":
+                yield
+                return
+
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                elapsed = time.perf_counter() - start
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+                self._write_stage(name, profile, before, after, peak, elapsed)
+        finally:
+            self.current_stage = previous
+
+    def _write_stage(self, name, profile, before, after, peak, elapsed):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, name)
+        profile.dump_stats(base + ".prof")
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(profile, stream=buffer)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        with open(base + "_top.txt", "w", encoding="utf-8") as f:
+            f.write(buffer.getvalue())
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        with open(base + "_alloc.txt", "w", encoding="utf-8") as f:
+            f.write(f"Etapa: {name}\nDuração: {elapsed:.3f} s\nPico de memória: {peak / 2**20:.1f} MiB\n\n")
+            f.write(f"Top {self.top} alocações (diferença face ao início da etapa):\n")
+            for stat in diff[:self.top]:
+                f.write(f"{stat}\n")
+
+        print(f"Perfil da etapa '{name}': {elapsed:.2f} s, pico {peak / 2**20:.1f} MiB -> {base}.prof")
+
+    # Modo "sample"
+    def start(self):
+        if self.mode == "sample" and self._thread is None:
+            self._target = threading.current_thread().ident
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[(self.current_stage,) + tuple(reversed(stack))] += 1
+
+    def stop(self):
+        """Termina a amostragem e escreve os relatórios (modo "sample")."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._write_samples()
+
+    def _write_samples(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        folded_path = os.path.join(self.output_dir, "samples.folded")
+        with open(folded_path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(";".join(stack) + f" {count}\n")
+
+        total = sum(self.samples.values()) or 1
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for label in set(stack[1:]):
+                inclusive[label] += count
+
+        top_path = os.path.join(self.output_dir, "samples_top.txt")
+        with open(top_path, "w", encoding="utf-8") as f:
+            f.write(f"Amostras: {total} (intervalo {self.interval * 1000:.0f} ms)\n\n")
+            f.write("Tempo próprio:\n")
+            for label, count in own.most_common(self.top):
+                f.write(f"  {count / total:6.1%}  {label}\n")
+            f.write("\nTempo inclusivo:\n")
+            for label, count in inclusive.most_common(self.top):
+                f.write(f"  {count / total:6.1%}  {label}\n")
+
+        print(f"Perfil por amostragem: {total} amostras -> {folded_path}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def profile_stage(profiler, name):
+    """Contexto da etapa `name`, ou um contexto vazio se não houver profiler."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name)
@@ -0,0 +1,122 @@
+import json
+import os
+import time
+
+
+class PageSchedule:
+    """Estado de uma página da listagem: intervalo atual, próxima visita e ritmo de ofertas novas."""
+
+    def __init__(self, page, interval, next_due=0.0, last_visit=None, rate=None, visits=0, new_offers=0):
+        self.page = page
+        self.interval = interval
+        self.next_due = next_due
+        self.last_visit = last_visit
+        # Média exponencial das ofertas novas por hora (None até à segunda visita)
+        self.rate = rate
+        self.visits = visits
+        self.new_offers = new_offers
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class RefreshScheduler:
+    """
+    Agenda as visitas a cada página da listagem conforme o ritmo a que
+    nela aparecem ofertas novas (links ainda não vistos pelo UrlFrontier).
+
+    As páginas começam com intervalos proporcionais à profundidade
+    (página N: N × `min_interval`). Depois de cada visita, o ritmo da
+    página (ofertas novas por hora, em média exponencial com peso
+    `smoothing`) fixa o intervalo seguinte de modo a esperar
+    `target_new` ofertas novas por visita, entre `min_interval` e
+    `max_interval` segundos. As primeiras páginas, onde entram as
+    ofertas novas, são revisitadas em minutos; as mais fundas, que só
+    recebem ofertas já vistas empurradas pelas novas, recuam até ao máximo.
+    """
+
+    def __init__(self, pages=10, min_interval=300, max_interval=6 * 3600, target_new=1.0, smoothing=0.3):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("intervalos inválidos: é preciso 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.smoothing = smoothing
+        self.pages = {
+            page: PageSchedule(page, self._clamp(min_interval * page))
+            for page in range(1, pages + 1)
+        }
+
+    def _clamp(self, interval):
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def due(self, now=None):
+        """Páginas cuja visita está em atraso, por ordem."""
+        now = time.time() if now is None else now
+        return sorted(page for page, state in self.pages.items() if state.next_due <= now)
+
+    def next_due(self):
+        """Instante (epoch) da próxima visita agendada."""
+        return min(state.next_due for state in self.pages.values())
+
+    def observe(self, page, new_offers, now=None):
+        """
+        Regista a visita à página com `new_offers` ofertas novas e agenda
+        a seguinte. Retorna o novo intervalo em segundos.
+        """
+        now = time.time() if now is None else now
+        state = self.pages[page]
+        # Na primeira visita todos os links podem ser novos (frontier vazio): não conta para o ritmo
+        if state.last_visit is not None:
+            hours = max(now - state.last_visit, 1.0) / 3600
+            observed = new_offers / hours
+            if state.rate is None:
+                state.rate = observed
+            else:
+                state.rate = self.smoothing * observed + (1 - self.smoothing) * state.rate
+            if state.rate > 0:
+                state.interval = self._clamp(self.target_new / state.rate * 3600)
+            else:
+                state.interval = self.max_interval
+
+        state.last_visit = now
+        state.next_due = now + state.interval
+        state.visits += 1
+        state.new_offers += new_offers
+        return state.interval
+
+    def to_dict(self):
+        return {"pages": [state.to_dict() for state in self.pages.values()]}
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, pages=10, **options):
+        """
+        Agenda guardada em `path` (ou uma nova, se não existir). As páginas
+        acrescentadas por `pages` começam com o intervalo por omissão e as
+        que ficaram de fora são esquecidas.
+        """
+        scheduler = cls(pages=pages, **options)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            for item in data.get("pages", []):
+                if item["page"] in scheduler.pages:
+                    state = PageSchedule.from_dict(item)
+                    state.interval = scheduler._clamp(state.interval)
+                    if state.last_visit is not None:
+                        state.next_due = min(state.next_due, state.last_visit + state.interval)
+                    scheduler.pages[state.page] = state
+        return scheduler
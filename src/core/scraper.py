@@ -1,16 +1,56 @@
 import time
 import re
+from collections import Counter
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
+from .offer import JobOffer
+from .dates import normalize_pub_date, parse_pub_date
+from .frontier import UrlFrontier, canonicalize_url
+from .html_store import StoredPages
+from .metrics import metrics
+
+SITE_URL = "https://www.itjobs.pt"
+
+# Campos que, no modo rápido, a listagem tem de decidir com confiança
+# suficiente para a página individual não ser visitada
+DETAIL_FIELDS = ("seniority", "category", "mode", "contract_type")
+
+# Palavras que indicam o modo de trabalho explicitamente em .list-details
+WORK_MODE_WORDS = ("remot", "híbrido", "hibrido", "presencial", "on-site")
+
+# Data da oferta na listagem, quando o site a mostra (atributo datetime ou texto)
+LISTING_DATE_SELECTOR = "time, .list-date"
 
 class JobScraper:
-    def __init__(self, base_url="https://www.itjobs.pt/ofertas", max_pages=3):
+    def __init__(self, base_url="https://www.itjobs.pt/ofertas", max_pages=3, html_store=None, offline=False,
+                 fast=False, min_confidence=0.6, detail_budget=None, since=None, frontier=None, keep_driver=False):
         self.base_url = base_url
         self.max_pages = max_pages
         self.driver = None
+        # HtmlStore opcional: guarda o HTML bruto; em modo offline as páginas
+        # são lidas do store em vez de descarregadas (re-extração sem novo crawl)
+        self.html_store = html_store
+        self.offline = offline and html_store is not None
+        # Modo rápido: classifica pela listagem e só visita as páginas individuais
+        # das ofertas com campos abaixo de `min_confidence`, até `detail_budget` visitas
+        self.fast = fast
+        self.min_confidence = min_confidence
+        self.detail_budget = detail_budget
+        self.detail_fetches = 0
+        # Páginas individuais relidas do HtmlStore (FRESH) em vez de descarregadas
+        self.detail_cache_hits = 0
+        self.new_links = set()
+        # Data limite (date): ofertas publicadas antes são ignoradas e a paginação
+        # pára na primeira página em que todas as ofertas são anteriores
+        self.since = since
+        # UrlFrontier persistente (URLs vistos entre runs); sem ele, só evita repetições no run
+        self.frontier = frontier
+        # Mantém o Chrome aberto entre chamadas (modo daemon); fechado por close()
+        self.keep_driver = keep_driver
 
+    @metrics.timed("classify_seniority")
     def extract_seniority(self, title, description=""):
         """
         Extrai o nível de seniority usando título e descrição.
@@ -92,6 +132,7 @@ class JobScraper:
         
         return "N/A"
 
+    @metrics.timed("classify_category")
     def extract_category(self, title, description="", technologies=""):
         """
         Extrai categoria profissional usando título, descrição e tecnologias.
@@ -246,6 +287,7 @@ class JobScraper:
         
         return "N/A"
 
+    @metrics.timed("classify_technologies")
     def extract_technologies(self, text):
         """
         Extrai tecnologias de um texto usando múltiplas estratégias.
@@ -377,6 +419,7 @@ class JobScraper:
         # 4. Converter para lista ordenada
         return sorted(list(found_techs))
 
+    @metrics.timed("classify_work_mode")
     def extract_work_mode(self, text, description=""):
         """
         Extrai modo(s) de trabalho, suportando múltiplos modos.
@@ -467,7 +510,9 @@ class JobScraper:
         return ", ".join(sorted_modes)
 
     def init_driver(self):
-        """Inicializa o Chrome em modo headless."""
+        """Inicializa o Chrome em modo headless (se ainda não estiver aberto)."""
+        if self.driver is not None:
+            return
         options = Options()
         options.add_argument("--headless")
         options.add_argument("--disable-gpu")
@@ -475,167 +520,419 @@ class JobScraper:
         service = Service()
         self.driver = webdriver.Chrome(service=service, options=options)
 
+    def release_driver(self):
+        """Fecha o Chrome no fim de uma etapa, exceto com `keep_driver`."""
+        if not self.keep_driver:
+            self.close()
+
+    def close(self):
+        """Fecha o Chrome."""
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+    def listing_url(self, page):
+        return f"{self.base_url}?page={page}"
+
+    def listing_links(self, page_html):
+        """Links canónicos das ofertas de uma página da listagem."""
+        soup = BeautifulSoup(page_html, "html.parser")
+        links = (canonicalize_url(tag.get("href"), SITE_URL)
+                 for tag in soup.select("ul.listing > li .list-title a.title"))
+        return [link for link in links if link]
+
+    def fetch_page(self, url, wait=2, stage="detail_fetch"):
+        """
+        Devolve o HTML do URL. Com HtmlStore, o HTML é guardado no store;
+        em modo offline é lido do store sem aceder ao site.
+        A duração fica registada nas métricas da etapa `stage`.
+        """
+        with metrics.timer(stage):
+            if self.offline:
+                html = self.html_store.get_url(url)
+            else:
+                self.driver.get(url)
+                time.sleep(wait)
+                html = self.driver.page_source
+                if self.html_store is not None:
+                    self.html_store.put(url, html)
+
+        if html is None:
+            metrics.inc("fetch_misses_total", stage=stage)
+        else:
+            metrics.inc("pages_fetched_total", stage=stage)
+            metrics.inc("bytes_fetched_total", len(html), stage=stage)
+        return html
+
     def get_job_pages(self, num_pages=3):
-        self.init_driver()
+        if not self.offline:
+            self.init_driver()
         pages_html = []
+        digests = []
 
         for page in range(1, num_pages + 1):
-            url = f"{self.base_url}?page={page}"
+            url = self.listing_url(page)
             print(f"📄 A carregar página {page}: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-            pages_html.append(self.driver.page_source)
+            html = self.fetch_page(url, wait=3, stage="listing_fetch")
+            if html is None:
+                print(f"   ⚠️ Página não encontrada no store: {url}")
+                continue
+            if self.since and self.listing_older_than_cutoff(html):
+                print(f"   Todas as ofertas da página {page} são anteriores a {self.since} - paginação terminada")
+                break
+            if self.html_store is not None:
+                # Só o hash fica em memória; o HTML é lido do store sob pedido
+                digests.append(self.html_store.digest_for(url))
+            else:
+                pages_html.append(html)
 
-        self.driver.quit()
+        self.release_driver()
+
+        if self.html_store is not None:
+            return StoredPages(self.html_store, digests)
         return pages_html
 
-    def extract_raw_jobs(self, pages_html):
+    def listing_older_than_cutoff(self, page_html):
+        """True se todas as ofertas da listagem têm data e são anteriores a `since`."""
+        soup = BeautifulSoup(page_html, "html.parser")
+        offers = soup.select("ul.listing > li")
+        dates = [parse_pub_date(self.listing_date(offer)) for offer in offers]
+        return bool(dates) and all(d is not None and d < self.since for d in dates)
+
+    def is_before_cutoff(self, pub_date):
+        """True se a data (ISO) é conhecida e anterior a `since`."""
+        if not self.since:
+            return False
+        parsed = parse_pub_date(pub_date)
+        return parsed is not None and parsed < self.since
+
+    def extract_raw_jobs(self, pages_html, on_offer=None, on_new_offer=None):
         """
         Extrai dados completos das ofertas visitando páginas individuais para máxima precisão.
+        `on_offer`, se indicado, é chamado com cada oferta assim que é extraída;
+        `on_new_offer` só com as ofertas cujo link o frontier ainda não conhecia
+        (com um frontier persistente, cada oferta é "nova" uma única vez).
         """
         all_offers = []
 
+        for offer in self.iter_raw_jobs(pages_html):
+            all_offers.append(offer)
+            if on_offer is not None:
+                on_offer(offer)
+            if on_new_offer is not None and offer.link in self.new_links:
+                on_new_offer(offer)
+
+        print(f"Foram extraídas {len(all_offers)} ofertas completas.")
+        if self.fast:
+            # Em modo offline as páginas "visitadas" também vêm do store
+            downloaded = 0 if self.offline else self.detail_fetches
+            from_store = self.detail_cache_hits + (self.detail_fetches if self.offline else 0)
+            skipped = len(all_offers) - downloaded - from_store
+            print(f"Modo rápido: {downloaded} páginas individuais descarregadas, "
+                  f"{from_store} relidas do HtmlStore, "
+                  f"{skipped} ofertas classificadas só pela listagem.")
+        return all_offers
+
+    def iter_raw_jobs(self, pages_html):
+        """
+        Versão em stream de extract_raw_jobs: produz cada JobOffer assim que
+        a sua página individual é analisada.
+
+        Primeiro lê todas as listagens e agenda os links no frontier (sem
+        repetições); depois visita as páginas individuais por prioridade:
+        ofertas novas, desatualizadas e, por fim, as vistas recentemente,
+        que são relidas do HtmlStore em vez de descarregadas outra vez.
+        """
         # Inicializa o driver para visitar páginas individuais
-        self.init_driver()
-
-        for page_html in pages_html:
-            soup = BeautifulSoup(page_html, "html.parser")
-            offers = soup.select("ul.listing > li")
-
-            for offer in offers:
-                # Título e link
-                title_tag = offer.select_one(".list-title a.title")
-                title = title_tag.get_text(strip=True) if title_tag else "N/A"
-                link = "N/A"
-                if title_tag and title_tag.get("href"):
-                    href = title_tag["href"]
-                    if href.startswith("/oferta/"):
-                        link = "https://www.itjobs.pt" + href
-                    elif href.startswith("http"):
-                        link = href
-
-                # Empresa
-                company_tag = offer.select_one(".list-name a")
-                company = company_tag.get_text(strip=True) if company_tag else "N/A"
-
-                # Localização e outros detalhes da lista
-                location = "N/A"
-                contract_type = "N/A"
-                mode = "N/A"
-                
-                details_tag = offer.select_one(".list-details")
-                if details_tag:
-                    details_text = details_tag.get_text(" ", strip=True)
-                    
-                    # Extrair localização (primeiro conjunto de cidades antes de outros detalhes)
-                    # As cidades aparecem no início: "Lisboa, Porto Full-time Remoto"
-                    cities = ["Lisboa", "Porto", "Coimbra", "Braga", "Aveiro", "Faro", "Viseu", "Setúbal"]
-                    found_cities = []
-                    
-                    # Procura por cidades no texto
-                    for city in cities:
-                        if city in details_text:
-                            found_cities.append(city)
-                    
-                    if found_cities:
-                        location = ", ".join(found_cities)
-                    
-                    # Extrair tipo de contrato
-                    if "Full-time" in details_text:
-                        contract_type = "Full-time"
-                    elif "Part-time" in details_text:
-                        contract_type = "Part-time"
-                    elif "Freelance" in details_text:
-                        contract_type = "Freelance"
-                    
-                    # Extrair modo de trabalho (suporte para múltiplos modos)
-                    mode = self.extract_work_mode(details_text)
-
-                # Inicializa campos que serão preenchidos na página individual
-                description = "N/A"
-                pub_date = "N/A"
-                seniority = "N/A"
-                category = "N/A"
-                technologies = "N/A"
+        if not self.offline:
+            self.init_driver()
+
+        self.detail_fetches = 0
+        self.detail_cache_hits = 0
+        self.new_links = set()  # links nunca vistos antes deste run (prioridade NEW)
+        # Em modo offline nada é descarregado: o frontier só evita repetições
+        frontier = self.frontier if self.frontier is not None and not self.offline else UrlFrontier()
+        # Cada extração é um run: o mesmo frontier pode servir vários ciclos do daemon
+        frontier.reset()
+        pending = {}            # link -> (job, texto de .list-details, índice da página)
+        page_total = Counter()  # ofertas (sem repetições) de cada página da listagem
+        page_old = Counter()    # ... das quais anteriores a `since`
+        try:
+            for page_index, page_html in enumerate(pages_html):
+                with metrics.timer("listing_parse"):
+                    soup = BeautifulSoup(page_html, "html.parser")
+                offers = soup.select("ul.listing > li")
+
+                for offer in offers:
+                    job, details_text = self.parse_listing_offer(offer)
+                    if job["link"] != "N/A":
+                        priority = frontier.add(job["link"])
+                        if priority is None:
+                            metrics.inc("frontier_duplicates_total")
+                            continue
+                        if priority == UrlFrontier.NEW:
+                            self.new_links.add(job["link"])
+                    page_total[page_index] += 1
+
+                    # Com data na listagem, as ofertas antigas nem chegam a ser visitadas
+                    if self.is_before_cutoff(job["pub_date"]):
+                        page_old[page_index] += 1
+                        metrics.inc("offers_before_cutoff_total")
+                        continue
+
+                    if job["link"] == "N/A":
+                        metrics.inc("offers_extracted_total")
+                        yield JobOffer(**job)
+                    else:
+                        pending[job["link"]] = (job, details_text, page_index)
+
+                # Listagem por ordem de publicação: as páginas seguintes são ainda mais antigas
+                if offers and page_total[page_index] and page_old[page_index] == page_total[page_index]:
+                    print(f"   Ofertas anteriores a {self.since} - extração terminada")
+                    break
+
+            page_left = Counter(page_index for _, _, page_index in pending.values())
+            cutoff_page = None
+            for link, priority in frontier.drain():
+                if link not in pending:
+                    continue  # antiga segundo a data da listagem
+                job, details_text, page_index = pending.pop(link)
+                if cutoff_page is not None and page_index > cutoff_page:
+                    continue
+                page_left[page_index] -= 1
 
                 # Visita a página individual para obter detalhes completos
-                if link != "N/A":
-                    try:
-                        print(f"     Analisando: {title[:50]}...")
-                        self.driver.get(link)
-                        time.sleep(2)
-                        job_soup = BeautifulSoup(self.driver.page_source, "html.parser")
-
-                        # Data de publicação (na classe over-title)
-                        date_tag = job_soup.select_one(".over-title small")
-                        if date_tag:
-                            pub_date = date_tag.get_text(strip=True)
-
-                        # Tipo de contrato (melhorado - procura por "Contrato" na lista de detalhes)
-                        contract_items = job_soup.select(".item-details .list-inline li")
-                        for item in contract_items:
-                            title_span = item.select_one(".title")
-                            field_span = item.select_one(".field")
-                            if title_span and field_span and "contrato" in title_span.get_text(strip=True).lower():
-                                contract_type = field_span.get_text(strip=True)
-                                break
-
-                        # Remoto/Modo de trabalho (melhorado - procura na lista de detalhes + descrição)
-                        remote_details = []
-                        for item in contract_items:
-                            title_span = item.select_one(".title")
-                            field_span = item.select_one(".field")
-                            if title_span and field_span and "remoto" in title_span.get_text(strip=True).lower():
-                                remote_details.append(field_span.get_text(strip=True))
-                        
-                        # Extrair modo de trabalho considerando detalhes + descrição
-                        remote_text = " ".join(remote_details)
-                        mode = self.extract_work_mode(remote_text, description)
-
-                        # Descrição (da classe content-block)
-                        desc_tag = job_soup.select_one(".content-block")
-                        if desc_tag:
-                            # Remove scripts e outros elementos desnecessários
-                            for script in desc_tag(["script", "style"]):
-                                script.decompose()
-                            description = desc_tag.get_text(" ", strip=True)
-                            # Limita o tamanho da descrição
-                            if len(description) > 800:
-                                description = description[:800] + "..."
-
-                        # Tecnologias extraídas da descrição e título (se ainda não foram encontradas ou para melhorar)
-                        full_text = title + " " + description
-                        found_techs_complete = self.extract_technologies(full_text)
-                        
-                        if found_techs_complete:
-                            technologies = ", ".join(found_techs_complete)
-
-                        # Melhora seniority e categoria com dados completos
-                        seniority = self.extract_seniority(title, description)
-                        category = self.extract_category(title, description, technologies)
-
-                        # Modo de trabalho já foi extraído acima com detecção melhorada
-
-                    except Exception as e:
-                        print(f"   ⚠️ Erro ao processar {link}: {e}")
-
-                all_offers.append({
-                    "title": title,
-                    "company": company,
-                    "location": location,
-                    "contract_type": contract_type,
-                    "seniority": seniority,
-                    "technologies": technologies,
-                    "description": description,
-                    "link": link,
-                    "pub_date": pub_date,
-                    "mode": mode,
-                    "category": category
-                })
-
-        # Fecha o driver
-        if self.driver:
-            self.driver.quit()
+                self.complete_offer(job, details_text, priority, frontier)
+                if self.is_before_cutoff(job["pub_date"]):
+                    page_old[page_index] += 1
+                    metrics.inc("offers_before_cutoff_total")
+                    # Página da listagem só com ofertas antigas: ignora as seguintes
+                    if not page_left[page_index] and page_old[page_index] == page_total[page_index] \
+                            and (cutoff_page is None or page_index < cutoff_page):
+                        cutoff_page = page_index
+                        print(f"   Ofertas anteriores a {self.since} a partir da página {page_index + 1}")
+                    continue
 
-        print(f"Foram extraídas {len(all_offers)} ofertas completas.")
-        return all_offers
\ No newline at end of file
+                metrics.inc("offers_extracted_total")
+                yield JobOffer(**job)
+
+        finally:
+            # Fecha o driver
+            self.release_driver()
+
+    def complete_offer(self, job, details_text, priority, frontier):
+        """
+        Completa `job` com a página individual: relida do HtmlStore se foi
+        descarregada há menos de `refresh_after` (FRESH), senão descarregada
+        quando needs_details o decide.
+        """
+        link = job["link"]
+        if priority == UrlFrontier.FRESH and self.html_store is not None and not self.offline:
+            html = self.html_store.get_url(link)
+            if html is not None:
+                metrics.inc("detail_cache_hits_total")
+                self.detail_cache_hits += 1
+                self.extract_details(job, html)
+                return
+
+        if self.needs_details(job, details_text):
+            self.detail_fetches += 1
+            if self.extract_details(job) and not self.offline:
+                frontier.mark_fetched(link)
+
+    def listing_date(self, offer):
+        """Texto da data da oferta na listagem, ou "N/A" se o site não a mostra."""
+        date_tag = offer.select_one(LISTING_DATE_SELECTOR)
+        if not date_tag:
+            return "N/A"
+        return date_tag.get("datetime") or date_tag.get_text(strip=True) or "N/A"
+
+    def parse_listing_offer(self, offer):
+        """
+        Campos de uma oferta da listagem (`ul.listing > li`). Retorna o dict
+        com os argumentos de JobOffer e o texto de `.list-details`. No modo
+        rápido, seniority, categoria e tecnologias são já classificados aqui.
+        """
+        # Título e link
+        title_tag = offer.select_one(".list-title a.title")
+        title = title_tag.get_text(strip=True) if title_tag else "N/A"
+        link = "N/A"
+        if title_tag and title_tag.get("href"):
+            # Forma canónica: a mesma oferta tem sempre o mesmo link (chave no frontier e no SQLite)
+            link = canonicalize_url(title_tag["href"], SITE_URL) or "N/A"
+
+        # Empresa
+        company_tag = offer.select_one(".list-name a")
+        company = company_tag.get_text(strip=True) if company_tag else "N/A"
+
+        # Localização e outros detalhes da lista
+        location = "N/A"
+        contract_type = "N/A"
+        mode = "N/A"
+        details_text = ""
+
+        details_tag = offer.select_one(".list-details")
+        if details_tag:
+            details_text = details_tag.get_text(" ", strip=True)
+
+            # Extrair localização (primeiro conjunto de cidades antes de outros detalhes)
+            # As cidades aparecem no início: "Lisboa, Porto Full-time Remoto"
+            cities = ["Lisboa", "Porto", "Coimbra", "Braga", "Aveiro", "Faro", "Viseu", "Setúbal"]
+            found_cities = []
+
+            # Procura por cidades no texto
+            for city in cities:
+                if city in details_text:
+                    found_cities.append(city)
+
+            if found_cities:
+                location = ", ".join(found_cities)
+
+            # Extrair tipo de contrato
+            if "Full-time" in details_text:
+                contract_type = "Full-time"
+            elif "Part-time" in details_text:
+                contract_type = "Part-time"
+            elif "Freelance" in details_text:
+                contract_type = "Freelance"
+
+            # Extrair modo de trabalho (suporte para múltiplos modos)
+            mode = self.extract_work_mode(details_text)
+
+        # Campos preenchidos na página individual (no modo rápido, primeiro pela listagem)
+        seniority = "N/A"
+        category = "N/A"
+        technologies = "N/A"
+        if self.fast and title != "N/A":
+            found_techs = self.extract_technologies(title + " " + details_text)
+            if found_techs:
+                technologies = ", ".join(found_techs)
+            seniority = self.extract_seniority(title)
+            category = self.extract_category(title, "", technologies if found_techs else "")
+
+        job = {
+            "title": title,
+            "company": company,
+            "location": location,
+            "contract_type": contract_type,
+            "seniority": seniority,
+            "technologies": technologies,
+            "description": "N/A",
+            "link": link,
+            "pub_date": normalize_pub_date(self.listing_date(offer)),
+            "mode": mode,
+            "category": category,
+        }
+        return job, details_text
+
+    def listing_confidence(self, job, details_text):
+        """
+        Confiança (0 a 1) de cada campo classificado só a partir da listagem:
+        0 se o campo está em falta, mais alta quando o valor é explícito em
+        `.list-details` do que quando é inferido do título.
+        """
+        def found(value):
+            return value not in ("N/A", "")
+
+        details_lower = details_text.lower()
+        # extract_work_mode assume "Presencial" quando a listagem não indica o modo
+        explicit_mode = any(word in details_lower for word in WORK_MODE_WORDS)
+
+        return {
+            "contract_type": 1.0 if found(job["contract_type"]) else 0.0,
+            "mode": (0.9 if explicit_mode else 0.3) if found(job["mode"]) else 0.0,
+            "seniority": 0.8 if found(job["seniority"]) else 0.0,
+            "category": 0.7 if found(job["category"]) else 0.0,
+        }
+
+    def needs_details(self, job, details_text):
+        """
+        Decide se a página individual da oferta é visitada. No modo completo
+        é sempre; no modo rápido só quando algum campo de DETAIL_FIELDS fica
+        abaixo de `min_confidence` e ainda há orçamento (`detail_budget`).
+        """
+        if not self.fast:
+            return True
+
+        confidence = self.listing_confidence(job, details_text)
+        if all(confidence[field] >= self.min_confidence for field in DETAIL_FIELDS):
+            metrics.inc("details_skipped_total", reason="confident")
+            return False
+        if self.detail_budget is not None and self.detail_fetches >= self.detail_budget:
+            metrics.inc("details_skipped_total", reason="budget")
+            return False
+        return True
+
+    def extract_details(self, job, job_html=None):
+        """
+        Completa `job` com os dados da página individual da oferta
+        (`job_html`, ou descarregada). Retorna True se a página foi analisada.
+        """
+        title = job["title"]
+        link = job["link"]
+        try:
+            print(f"     Analisando: {title[:50]}...")
+            if job_html is None:
+                job_html = self.fetch_page(link)
+            if job_html is None:
+                raise ValueError("página não encontrada no store")
+            with metrics.timer("detail_parse"):
+                job_soup = BeautifulSoup(job_html, "html.parser")
+
+            # Data de publicação (na classe over-title)
+            date_tag = job_soup.select_one(".over-title small")
+            if date_tag:
+                # Normalizada para AAAA-MM-DD (também as formas relativas, "há 3 dias")
+                job["pub_date"] = normalize_pub_date(date_tag.get_text(strip=True))
+
+            # Tipo de contrato (melhorado - procura por "Contrato" na lista de detalhes)
+            contract_items = job_soup.select(".item-details .list-inline li")
+            for item in contract_items:
+                title_span = item.select_one(".title")
+                field_span = item.select_one(".field")
+                if title_span and field_span and "contrato" in title_span.get_text(strip=True).lower():
+                    job["contract_type"] = field_span.get_text(strip=True)
+                    break
+
+            # Remoto/Modo de trabalho (melhorado - procura na lista de detalhes + descrição)
+            remote_details = []
+            for item in contract_items:
+                title_span = item.select_one(".title")
+                field_span = item.select_one(".field")
+                if title_span and field_span and "remoto" in title_span.get_text(strip=True).lower():
+                    remote_details.append(field_span.get_text(strip=True))
+
+            # Extrair modo de trabalho considerando detalhes + descrição
+            remote_text = " ".join(remote_details)
+            job["mode"] = self.extract_work_mode(remote_text, job["description"])
+
+            # Descrição (da classe content-block)
+            desc_tag = job_soup.select_one(".content-block")
+            if desc_tag:
+                # Remove scripts e outros elementos desnecessários
+                for script in desc_tag(["script", "style"]):
+                    script.decompose()
+                description = desc_tag.get_text(" ", strip=True)
+                # Limita o tamanho da descrição
+                if len(description) > 800:
+                    description = description[:800] + "..."
+                job["description"] = description
+
+            # Tecnologias extraídas da descrição e título (se ainda não foram encontradas ou para melhorar)
+            full_text = title + " " + job["description"]
+            found_techs_complete = self.extract_technologies(full_text)
+
+            if found_techs_complete:
+                job["technologies"] = ", ".join(found_techs_complete)
+
+            # Melhora seniority e categoria com dados completos
+            job["seniority"] = self.extract_seniority(title, job["description"])
+            job["category"] = self.extract_category(title, job["description"], job["technologies"])
+
+            # Modo de trabalho já foi extraído acima com detecção melhorada
+
+        except Exception as e:
+            metrics.inc("detail_errors_total")
+            print(f"   ⚠️ Erro ao processar {link}: {e}")
+            return False
+        return True
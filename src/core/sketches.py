@@ -0,0 +1,297 @@
+import hashlib
+import json
+import math
+import os
+import random
+
+
+def _hash64(value):
+    """Hash de 64 bits (blake2b) de um valor, estável entre execuções."""
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """
+    Estimativa do número de valores distintos com 2^p registos de 1 byte.
+    Erro padrão relativo ≈ 1.04 / sqrt(2^p) (p=12: 4 KB, ≈1.6%).
+    Para cardinalidades pequenas usa contagem linear, que é quase exata.
+    """
+
+    def __init__(self, p=12):
+        if not 4 <= p <= 16:
+            raise ValueError("p tem de estar entre 4 e 16")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    @property
+    def error(self):
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        # Posição do primeiro bit a 1 nos restantes 64-p bits
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("HyperLogLog com precisões diferentes")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def to_dict(self):
+        return {"p": self.p, "registers": self.registers.hex()}
+
+    @classmethod
+    def from_dict(cls, data):
+        hll = cls(data["p"])
+        hll.registers = bytearray.fromhex(data["registers"])
+        return hll
+
+
+class SpaceSaving:
+    """
+    Itens mais frequentes (heavy hitters) com no máximo k contadores.
+    Após N inserções, cada contagem sobrestima a real em no máximo N/k
+    (o valor em `errors`), e qualquer item com frequência > N/k está
+    garantidamente entre os monitorizados.
+    """
+
+    def __init__(self, k=200):
+        self.k = k
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item, count=1):
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.k:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # Substitui o item com menor contagem, herdando-a como erro
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            del self.errors[victim]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+
+    def top(self, n=10):
+        """Lista [(item, contagem estimada)] por ordem decrescente."""
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+    @property
+    def max_error(self):
+        return self.total / self.k
+
+    def merge(self, other):
+        for item, count in other.counts.items():
+            self.add(item, count)
+            if item in self.errors:
+                self.errors[item] += other.errors[item]
+        # Itens descartados pelo outro sketch também contam para o total
+        self.total += other.total - sum(other.counts.values())
+        return self
+
+    def to_dict(self):
+        return {"k": self.k, "total": self.total, "counts": self.counts, "errors": self.errors}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"])
+        sketch.total = data["total"]
+        sketch.counts = dict(data["counts"])
+        sketch.errors = dict(data["errors"])
+        return sketch
+
+
+class ReservoirSample:
+    """Amostra uniforme de k itens de um stream de tamanho desconhecido (algoritmo R)."""
+
+    def __init__(self, k=100, seed=None):
+        self.k = k
+        self.seen = 0
+        self.items = []
+        self._rng = random.Random(seed)
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.k:
+            self.items.append(item)
+        else:
+            j = self._rng.randrange(self.seen)
+            if j < self.k:
+                self.items[j] = item
+
+    def merge(self, other):
+        """Combina duas amostras ponderando pelo número de itens vistos em cada uma."""
+        total = self.seen + other.seen
+        if total == 0:
+            return self
+        pool = [(item, self.seen) for item in self.items] + [(item, other.seen) for item in other.items]
+        chosen = []
+        while pool and len(chosen) < self.k:
+            index = self._rng.choices(range(len(pool)), weights=[w for _, w in pool])[0]
+            chosen.append(pool.pop(index)[0])
+        self.items = chosen
+        self.seen = total
+        return self
+
+    def to_dict(self):
+        return {"k": self.k, "seen": self.seen, "items": self.items}
+
+    @classmethod
+    def from_dict(cls, data):
+        sample = cls(data["k"])
+        sample.seen = data["seen"]
+        sample.items = list(data["items"])
+        return sample
+
+
+def _first_city(location):
+    if not location or location == "N/A":
+        return None
+    return str(location).split(",")[0].strip() or None
+
+
+def _technologies(value):
+    if not value or value == "N/A":
+        return []
+    return [tech.strip() for tech in str(value).split(",") if tech.strip()]
+
+
+class StreamingStats:
+    """
+    Estatísticas aproximadas com memória limitada para streams de ofertas
+    (JobOffer ou dicts com as chaves do CSV), alimentadas oferta a oferta,
+    p. ex. `scraper.extract_raw_jobs(pages, on_offer=stats.add)`.
+
+    Distintos (empresas, cidades, tecnologias, links): HyperLogLog.
+    Tops (empresas, cidades, tecnologias): Space-Saving.
+    Descrições: amostra de reservatório.
+
+    O estado acumula entre runs com `accumulate(path)`; para não contar a
+    mesma oferta em vários crawls, o scraper só deve alimentar as ofertas
+    novas (`extract_raw_jobs(..., on_new_offer=stats.add)`).
+    """
+
+    SKETCHES = {
+        "companies": HyperLogLog, "cities": HyperLogLog,
+        "technologies": HyperLogLog, "links": HyperLogLog,
+        "top_companies": SpaceSaving, "top_cities": SpaceSaving,
+        "top_technologies": SpaceSaving, "descriptions": ReservoirSample,
+    }
+
+    def __init__(self, p=12, top_k=200, sample_size=100, seed=None):
+        self.total = 0
+        self.companies = HyperLogLog(p)
+        self.cities = HyperLogLog(p)
+        self.technologies = HyperLogLog(p)
+        self.links = HyperLogLog(p)
+        self.top_companies = SpaceSaving(top_k)
+        self.top_cities = SpaceSaving(top_k)
+        self.top_technologies = SpaceSaving(top_k)
+        self.descriptions = ReservoirSample(sample_size, seed)
+
+    def add(self, offer):
+        self.total += 1
+
+        company = offer.get("Empresa", "N/A")
+        if company and company != "N/A":
+            self.companies.add(company)
+            self.top_companies.add(company)
+
+        city = _first_city(offer.get("Localização", "N/A"))
+        if city:
+            self.cities.add(city)
+            self.top_cities.add(city)
+
+        for tech in _technologies(offer.get("Tecnologias", "N/A")):
+            self.technologies.add(tech)
+            self.top_technologies.add(tech)
+
+        link = offer.get("Link", "N/A")
+        if link and link != "N/A":
+            self.links.add(link)
+
+        description = offer.get("Descrição", "N/A")
+        if description and description != "N/A":
+            self.descriptions.add(description)
+
+    def merge(self, other):
+        self.total += other.total
+        for name in self.SKETCHES:
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    def to_stats(self):
+        """Dicionário com as chaves usadas por render_summary_statistics."""
+        return {
+            "total_jobs": self.total,
+            # Links, não posições: os clusters de duplicados só existem depois do crawl
+            "distinct_links": self.links.count(),
+            "unique_companies": self.companies.count(),
+            "unique_cities": self.cities.count(),
+            "unique_technologies": self.technologies.count(),
+            "top_companies": self.top_companies.top(10),
+            "top_cities": self.top_cities.top(10),
+            "tech_counts": self.top_technologies.top(10),
+            "approximate": True,
+            "error_bounds": {
+                "distinct_relative": round(self.companies.error, 4),
+                "top_companies_abs": self.top_companies.max_error,
+                "top_cities_abs": self.top_cities.max_error,
+                "top_technologies_abs": self.top_technologies.max_error,
+            },
+        }
+
+    def to_dict(self):
+        data = {"total": self.total}
+        data.update({name: getattr(self, name).to_dict() for name in self.SKETCHES})
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.total = data["total"]
+        for name, sketch_cls in cls.SKETCHES.items():
+            setattr(stats, name, sketch_cls.from_dict(data[name]))
+        return stats
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def accumulate(self, path):
+        """
+        Junta este estado ao guardado em `path` (se existir) e guarda o
+        resultado, que é retornado. O ficheiro tem sempre o mesmo tamanho,
+        qualquer que seja o número de runs.
+        """
+        merged = self.load(path).merge(self) if os.path.exists(path) else self
+        merged.save(path)
+        return merged
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from .offer import CSV_COLUMNS
+
+# Campos que definem o conteúdo da oferta (o Cluster é derivado, não conta)
+HASHED_FIELDS = [column for column in CSV_COLUMNS if column not in ("Link", "Cluster")]
+
+
+def offer_hash(offer):
+    """Hash curto (blake2b, 8 bytes) dos campos normalizados de uma oferta."""
+    parts = [" ".join(str(offer.get(field, "N/A")).split()) for field in HASHED_FIELDS]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SnapshotIndex:
+    """
+    Índice de snapshots por execução: para cada run guarda {Link: hash}
+    em snapshot_<run>.json e calcula as diferenças face ao run anterior
+    (ofertas novas, removidas e alteradas) com operações sobre conjuntos.
+    """
+
+    def __init__(self, root="data/snapshots"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def for_scope(cls, pages, fast=False, detail_budget=None, root="data/snapshots"):
+        """
+        Índice dos runs com o mesmo alcance (páginas percorridas, modo rápido
+        e orçamento de detalhes), em <root>/<alcance>/: comparar um crawl de
+        3 páginas com um completo daria quase tudo como removido.
+        """
+        scope = f"pages_{pages}"
+        if fast:
+            scope += "_fast" if detail_budget is None else f"_fast_b{detail_budget}"
+        return cls(os.path.join(root, scope))
+
+    def runs(self):
+        """Identificadores dos runs guardados, por ordem cronológica."""
+        names = [f for f in os.listdir(self.root) if f.startswith("snapshot_") and f.endswith(".json")]
+        return sorted(name[len("snapshot_"):-len(".json")] for name in names)
+
+    def load(self, run_id):
+        with open(os.path.join(self.root, f"snapshot_{run_id}.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def build(self, offers):
+        """Snapshot {Link: hash} das ofertas (ofertas sem Link são ignoradas)."""
+        return {
+            offer.get("Link"): offer_hash(offer)
+            for offer in offers
+            if offer.get("Link", "N/A") != "N/A"
+        }
+
+    @staticmethod
+    def diff(previous, current):
+        """Retorna (novas, removidas, alteradas) como conjuntos de Links."""
+        prev_links = previous.keys()
+        curr_links = current.keys()
+        new = curr_links - prev_links
+        removed = prev_links - curr_links
+        changed = {link for link in curr_links & prev_links if current[link] != previous[link]}
+        return new, removed, changed
+
+    def record(self, offers, run_id=None):
+        """
+        Guarda o snapshot do run e escreve delta_<run>.json com as ofertas
+        novas e alteradas (registos completos) e os Links removidos.
+        Retorna o caminho do ficheiro delta.
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        previous_runs = self.runs()
+        previous_id = previous_runs[-1] if previous_runs else None
+        previous = self.load(previous_id) if previous_id else {}
+
+        current = self.build(offers)
+        with open(os.path.join(self.root, f"snapshot_{run_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(current, f, separators=(",", ":"))
+
+        new, removed, changed = self.diff(previous, current)
+        delta = {
+            "run": run_id,
+            "previous_run": previous_id,
+            "new": [],
+            "changed": [],
+            "removed": sorted(removed),
+        }
+        for offer in offers:
+            link = offer.get("Link")
+            if link in new:
+                delta["new"].append(dict(offer))
+                new.discard(link)
+            elif link in changed:
+                delta["changed"].append(dict(offer))
+                changed.discard(link)
+
+        delta_path = os.path.join(self.root, f"delta_{run_id}.json")
+        with open(delta_path, "w", encoding="utf-8") as f:
+            json.dump(delta, f, ensure_ascii=False, indent=1)
+
+        print(f"Snapshot {run_id}: {len(delta['new'])} novas, {len(delta['changed'])} alteradas, "
+              f"{len(removed)} removidas")
+        return delta_path
@@ -0,0 +1,167 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from .offer import JobOffer, CSV_TO_ATTR
+
+# Mapeamento entre as colunas do CSV e as colunas da tabela SQLite
+COLUMN_MAP = CSV_TO_ATTR
+
+# Datas de publicação normalizadas; as restantes (texto do site) não são comparáveis
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    link TEXT PRIMARY KEY,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    contract_type TEXT,
+    seniority TEXT,
+    technologies TEXT,
+    description TEXT,
+    pub_date TEXT,
+    mode TEXT,
+    category TEXT,
+    cluster_id TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_offers_company ON offers(company);
+CREATE INDEX IF NOT EXISTS idx_offers_category ON offers(category);
+CREATE INDEX IF NOT EXISTS idx_offers_seniority ON offers(seniority);
+CREATE INDEX IF NOT EXISTS idx_offers_pub_date ON offers(pub_date);
+CREATE INDEX IF NOT EXISTS idx_offers_first_seen ON offers(first_seen);
+CREATE INDEX IF NOT EXISTS idx_offers_last_seen ON offers(last_seen);
+CREATE INDEX IF NOT EXISTS idx_offers_category_first_seen ON offers(category, first_seen);
+"""
+
+
+class JobStorage:
+    """
+    Armazenamento das ofertas em SQLite, com upsert pela coluna Link.
+    Mantém as datas em que cada oferta foi vista pela primeira e última vez.
+    """
+
+    def __init__(self, db_path="data/jobs_itjobs.db", batch_size=500):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.conn = None
+
+    def connect(self):
+        """Abre a ligação em modo WAL e cria a tabela e os índices."""
+        if self.conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._migrate()
+        return self.conn
+
+    def _migrate(self):
+        """Acrescenta colunas novas a bases de dados criadas por versões anteriores."""
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(offers)")}
+        for col in COLUMN_MAP.values():
+            if col not in existing:
+                self.conn.execute(f"ALTER TABLE offers ADD COLUMN {col} TEXT")
+        self.conn.commit()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def upsert_jobs(self, data, seen_at=None):
+        """
+        Insere ou atualiza as ofertas (JobOffer ou dicts com as chaves do CSV) em
+        transações de `batch_size` registos. Ofertas sem Link são ignoradas.
+        Retorna o número de ofertas gravadas.
+        """
+        conn = self.connect()
+        seen_at = seen_at or datetime.now().isoformat(timespec="seconds")
+
+        columns = list(COLUMN_MAP.values())
+        placeholders = ", ".join(f":{col}" for col in columns)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns if col != "link")
+        sql = (
+            f"INSERT INTO offers ({', '.join(columns)}, first_seen, last_seen) "
+            f"VALUES ({placeholders}, :seen_at, :seen_at) "
+            f"ON CONFLICT(link) DO UPDATE SET {updates}, last_seen = excluded.last_seen"
+        )
+
+        saved = 0
+        batch = []
+        for row in data:
+            if isinstance(row, JobOffer):
+                record = row.to_db_record()
+            else:
+                record = {col: row.get(key, "N/A") for key, col in COLUMN_MAP.items()}
+            if not record["link"] or record["link"] == "N/A":
+                continue
+            record["seen_at"] = seen_at
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                with conn:
+                    conn.executemany(sql, batch)
+                saved += len(batch)
+                batch = []
+
+        if batch:
+            with conn:
+                conn.executemany(sql, batch)
+            saved += len(batch)
+
+        return saved
+
+    def query(self, category=None, company=None, seniority=None,
+              first_seen_since=None, last_seen_since=None, published_since=None):
+        """
+        Pesquisa ofertas usando os índices da tabela.
+        Todos os filtros são opcionais; datas em formato ISO. `published_since`
+        só considera datas de publicação já normalizadas (AAAA-MM-DD).
+        """
+        conn = self.connect()
+        filters = {
+            "category = ?": category,
+            "company = ?": company,
+            "seniority = ?": seniority,
+            "first_seen >= ?": first_seen_since,
+            "last_seen >= ?": last_seen_since,
+            f"pub_date >= ? AND pub_date GLOB '{ISO_DATE_GLOB}'": published_since,
+        }
+        clauses = [clause for clause, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+
+        sql = "SELECT * FROM offers"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY first_seen DESC"
+
+        return [dict(row) for row in conn.execute(sql, params)]
+
+    def new_offers(self, category=None, days=7):
+        """Ofertas vistas pela primeira vez nos últimos `days` dias."""
+        since = (datetime.now() - timedelta(days=days)).isoformat(timespec="seconds")
+        return self.query(category=category, first_seen_since=since)
+
+
+def save_to_sqlite(data, db_path):
+    if not data:
+        print("Nenhum dado para guardar.")
+        return
+
+    with JobStorage(db_path) as storage:
+        saved = storage.upsert_jobs(data)
+
+    print(f"{saved} ofertas guardadas em {db_path}")
@@ -1,6 +1,10 @@
 import csv
 import os
 
+from .metrics import metrics
+from .offer import CSV_COLUMNS
+
+@metrics.timed("csv_write")
 def save_to_csv(data, filepath):
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
@@ -8,16 +12,60 @@ def save_to_csv(data, filepath):
         print("Nenhum dado para guardar.")
         return
 
-    # Cria lista de chaves consistente para todas as linhas
-    all_keys = set()
-    for row in data:
-        all_keys.update(row.keys())
-    keys = list(all_keys)
-
-    # Escreve o CSV
+    # Colunas na ordem de JobOffer.FIELDS, iguais em todos os CSV
     with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
         writer.writeheader()
-        writer.writerows(data)
+        writer.writerows(offer.to_csv_row() for offer in data)
+    metrics.inc("csv_rows_written_total", len(data))
+
+    print(f"Dados guardados em {filepath}")
+
+
+# Campos de baixa cardinalidade guardados com dictionary encoding no Parquet
+CATEGORICAL_FIELDS = [
+    "Seniority", "Categoria", "Modo de trabalho",
+    "Tipo de contrato", "Empresa", "Localização"
+]
+
+def save_to_parquet(data, filepath):
+    """
+    Guarda as ofertas em Parquet: campos categóricos com dictionary encoding
+    e as tecnologias como coluna de listas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("pyarrow não está instalado - exportação Parquet ignorada.")
+        return
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    if not data:
+        print("Nenhum dado para guardar.")
+        return
+
+    keys = []
+    for row in data:
+        for key in row.keys():
+            if key not in keys:
+                keys.append(key)
+
+    columns = {}
+    for key in keys:
+        values = [row.get(key, "N/A") for row in data]
+        if key == "Tecnologias":
+            columns[key] = pa.array(
+                [[t.strip() for t in str(v).split(",") if t.strip()] if v != "N/A" else [] for v in values],
+                type=pa.list_(pa.string())
+            )
+        elif key in CATEGORICAL_FIELDS:
+            columns[key] = pa.array(values, type=pa.string()).dictionary_encode()
+        else:
+            columns[key] = pa.array([str(v) for v in values], type=pa.string())
+
+    table = pa.table(columns)
+    pq.write_table(table, filepath, compression="zstd", use_dictionary=CATEGORICAL_FIELDS)
 
     print(f"Dados guardados em {filepath}")
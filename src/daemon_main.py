@@ -0,0 +1,116 @@
+from core import JobScraper, JobParser, save_to_sqlite, HtmlStore, UrlFrontier, RefreshScheduler, StreamingStats, metrics
+from datetime import datetime, timedelta
+import argparse
+import time
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="JobScraper-Portugal em modo contínuo: revisita cada página da listagem "
+                    "com a frequência a que nela aparecem ofertas novas")
+    arg_parser.add_argument('--pages', type=int, default=10,
+                            help="número de páginas da listagem acompanhadas (por defeito: 10)")
+    arg_parser.add_argument('--min-interval', type=float, default=5,
+                            help="intervalo mínimo entre visitas a uma página, em minutos (por defeito: 5)")
+    arg_parser.add_argument('--max-interval', type=float, default=360,
+                            help="intervalo máximo entre visitas a uma página, em minutos (por defeito: 360)")
+    arg_parser.add_argument('--max-cycles', type=int, default=None,
+                            help="termina ao fim de N ciclos (por defeito: corre até ser interrompido)")
+    arg_parser.add_argument('--metrics-port', type=int, default=None,
+                            help="expõe as métricas em direto em http://127.0.0.1:PORTA/metrics")
+    arg_parser.add_argument('--fast', action='store_true',
+                            help="classifica pela listagem e só visita as páginas individuais "
+                                 "das ofertas com campos em falta ou pouco fiáveis")
+    arg_parser.add_argument('--min-confidence', type=float, default=0.6,
+                            help="confiança mínima (0-1) dos campos da listagem no modo --fast")
+    arg_parser.add_argument('--refresh-hours', type=float, default=24,
+                            help="ofertas visitadas há menos de N horas são relidas do HtmlStore "
+                                 "em vez de descarregadas (por defeito: 24)")
+    args = arg_parser.parse_args(argv)
+
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    scheduler = RefreshScheduler.load("data/scheduler.json", pages=args.pages,
+                                      min_interval=args.min_interval * 60,
+                                      max_interval=args.max_interval * 60)
+    frontier = UrlFrontier("data/frontier", refresh_after=timedelta(hours=args.refresh_hours))
+    with frontier, HtmlStore("data/html_store") as html_store:
+        run_daemon(scheduler, frontier, max_cycles=args.max_cycles, html_store=html_store,
+                   fast=args.fast, min_confidence=args.min_confidence)
+
+def run_daemon(scheduler, frontier, max_cycles=None, state_path="data/scheduler.json", **scraper_options):
+    """
+    Ciclos de recolha até `max_cycles` (ou até Ctrl+C). O scraper, o Chrome,
+    o HtmlStore e o frontier ficam abertos entre ciclos; cada ciclo só visita
+    as páginas da listagem que o scheduler dá como em atraso.
+    """
+    print("Iniciando o JobScraper-Portugal em modo contínuo...")
+    scraper = JobScraper(base_url="https://www.itjobs.pt/ofertas", frontier=frontier,
+                         keep_driver=True, **scraper_options)
+    parser = JobParser()
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            due = scheduler.due()
+            if not due:
+                wait = max(0.0, scheduler.next_due() - time.time())
+                print(f"Próximo ciclo às {datetime.fromtimestamp(time.time() + wait):%H:%M:%S}")
+                time.sleep(wait)
+                continue
+
+            cycles += 1
+            try:
+                run_cycle(scraper, parser, frontier, scheduler, due)
+            except Exception as e:
+                # Chrome pode ter morrido: é reaberto no ciclo seguinte
+                print(f"Erro no ciclo {cycles}: {e}")
+                metrics.inc("daemon_errors_total")
+                scraper.close()
+                time.sleep(scheduler.min_interval)
+            finally:
+                scheduler.save(state_path)
+                metrics.export("data/metrics")
+    except KeyboardInterrupt:
+        print("Modo contínuo interrompido.")
+    finally:
+        scraper.close()
+        scheduler.save(state_path)
+
+def run_cycle(scraper, parser, frontier, scheduler, due):
+    """
+    Visita as páginas `due`, reagenda-as pelas ofertas novas, guarda as
+    ofertas no SQLite e junta as novas aos sketches (data/stream_stats.json).
+    """
+    print(f"[{datetime.now():%H:%M:%S}] Ciclo: páginas {', '.join(map(str, due))}")
+    metrics.inc("daemon_cycles_total")
+    scraper.init_driver()
+
+    pages_html = []
+    total_new = 0
+    counted = set()  # links já contados neste ciclo (uma oferta pode passar de uma página para a seguinte)
+    for page in due:
+        html = scraper.fetch_page(scraper.listing_url(page), wait=3, stage="listing_fetch")
+        new_offers = 0
+        if html is not None:
+            # Ofertas novas: links que o frontier ainda não conhece, cada um contado uma só vez
+            links = set(scraper.listing_links(html)) - counted
+            counted |= links
+            new_offers = sum(1 for link in links if not frontier.seen(link))
+            pages_html.append(html)
+        interval = scheduler.observe(page, new_offers)
+        metrics.inc("daemon_new_offers_total", new_offers)
+        total_new += new_offers
+        print(f"   Página {page}: {new_offers} ofertas novas, próxima visita em {interval / 60:.0f} min")
+
+    # Ofertas novas e desatualizadas são descarregadas; as restantes vêm do HtmlStore.
+    # Os sketches só recebem as novas e acumulam de ciclo para ciclo
+    stream_stats = StreamingStats()
+    raw_jobs = scraper.extract_raw_jobs(pages_html, on_new_offer=stream_stats.add)
+    stream_stats.accumulate("data/stream_stats.json")
+    parsed_jobs = parser.parse_jobs(raw_jobs)
+    # Atualiza a base de dados histórica (upsert pelo Link)
+    save_to_sqlite(parsed_jobs, "data/jobs_itjobs.db")
+    print(f"   • {total_new} ofertas novas em {len(due)} páginas")
+
+if __name__ == "__main__":
+    main()
@@ -1,339 +1,959 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
 from datetime import datetime
 import os
+import sys
 import re
+import argparse
+import hashlib
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
+from contextlib import nullcontext
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configuração para suporte de caracteres portugueses
-plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial', 'sans-serif']
-sns.set_palette("husl")
+# Bibliotecas de gráficos: só são importadas ao renderizar (ver load_plotting),
+# pelo que agregados, rollups e exportação em JSON não as carregam
+plt = None
+sns = None
+PdfPages = None
+
+def load_plotting(backend=None):
+    """Importa matplotlib e seaborn e aplica o estilo dos gráficos (uma vez por processo)"""
+    global plt, sns, PdfPages
+    if plt is None:
+        import matplotlib.pyplot as pyplot
+        import seaborn
+        from matplotlib.backends.backend_pdf import PdfPages as pdf_pages
+        
+        # Configuração para suporte de caracteres portugueses
+        pyplot.rcParams['font.family'] = ['DejaVu Sans', 'Arial', 'sans-serif']
+        seaborn.set_palette("husl")
+        plt, sns, PdfPages = pyplot, seaborn, pdf_pages
+    if backend:
+        plt.switch_backend(backend)
+
+# Colunas usadas pelos gráficos (projeção na leitura de Parquet)
+REPORT_COLUMNS = ['Empresa', 'Localização', 'Tecnologias', 'Seniority', 'Categoria', 'Modo de trabalho']
+SENIORITY_LEVELS = ['Junior', 'Mid-level', 'Senior', 'Lead']
+# Coluna da data de publicação (AAAA-MM-DD), lida só para o filtro --since
+DATE_COLUMN = 'Data de publicação'
+# Colunas de baixa cardinalidade lidas com dtype `category`
+CATEGORY_COLUMNS = ['Empresa', 'Localização', 'Seniority', 'Categoria', 'Modo de trabalho', 'Modo']
+
+# Pasta dos rollups diários usados pelo relatório de tendências
+ROLLUP_DIR = os.path.join('data', 'rollups')
+
+# Versão do formato dos agregados (invalida a cache quando o cálculo muda)
+STATS_VERSION = 3
+
+def dataset_fingerprint(path, chunk_size=1 << 20):
+    """SHA-256 do conteúdo do ficheiro de dados (lido por blocos)"""
+    digest = hashlib.sha256(f"v{STATS_VERSION}:".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _counts(series):
+    """value_counts sem categorias vazias, como dict"""
+    counts = series.value_counts()
+    return counts[counts > 0].to_dict()
+
+def tech_items(df):
+    """
+    Tecnologias das ofertas, uma linha por (oferta, tecnologia) com o índice
+    da oferta: a partir da coluna de listas do Parquet ('Tecnologias_Lista')
+    ou do texto do CSV separado por vírgulas, sem ciclos em Python.
+    """
+    if 'Tecnologias_Lista' in df.columns:
+        items = df['Tecnologias_Lista'].explode()
+    else:
+        items = df['Tecnologias'].astype('string').str.split(',').explode().str.strip()
+    return items[items.notna() & ~items.isin(['', 'nan'])].astype(object)
+
+def tech_incidence_matrix(items):
+    """
+    Matriz esparsa (CSR) ofertas × tecnologias com 1 onde a oferta pede a
+    tecnologia, e o vocabulário correspondente às colunas. `items` tem uma
+    linha por (oferta, tecnologia), como a devolvida por tech_items.
+    """
+    from scipy import sparse
+    
+    codes, vocabulary = pd.factorize(items, sort=True)
+    rows = pd.factorize(items.index)[0]
+    n_offers = rows.max() + 1 if len(rows) else 0
+    matrix = sparse.csr_matrix(
+        (np.ones(len(codes), dtype=np.int32), (rows, codes)),
+        shape=(n_offers, len(vocabulary))
+    )
+    # Tecnologias repetidas na mesma oferta contam uma só vez
+    matrix.data[:] = 1
+    return matrix, np.asarray(vocabulary, dtype=object)
+
+def tech_cooccurrence(items):
+    """
+    Contagens de co-ocorrência {(tec_a, tec_b): n} com tec_a < tec_b,
+    a partir de um único produto esparso X^T X.
+    """
+    from scipy import sparse
+    
+    matrix, vocabulary = tech_incidence_matrix(items)
+    if matrix.shape[1] < 2:
+        return {}
+    pairs = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+    return dict(zip(zip(vocabulary[pairs.row], vocabulary[pairs.col]), pairs.data.tolist()))
+
+def tech_affinity(tech_counts, tech_pairs, n_offers):
+    """
+    Lift e PMI dos pares de tecnologias:
+    lift = N·n_ab / (n_a·n_b) e PMI = log2(lift).
+    Retorna um DataFrame com uma linha por par.
+    """
+    if not tech_pairs or not n_offers:
+        return pd.DataFrame(columns=['a', 'b', 'n_ab', 'support', 'lift', 'pmi'])
+    pairs = pd.DataFrame([(a, b, n) for (a, b), n in tech_pairs.items()], columns=['a', 'b', 'n_ab'])
+    n_a = pairs['a'].map(tech_counts).fillna(0).to_numpy(dtype=float)
+    n_b = pairs['b'].map(tech_counts).fillna(0).to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lift = n_offers * pairs['n_ab'].to_numpy(dtype=float) / (n_a * n_b)
+    pairs['support'] = pairs['n_ab'] / n_offers * 100
+    pairs['lift'] = lift
+    pairs['pmi'] = np.log2(lift)
+    return pairs[np.isfinite(pairs['lift'])]
+
+class ReportAggregates:
+    """
+    Contagens parciais do relatório. Cada bloco de dados é somado com
+    add_frame e dois agregados combinam-se com merge (soma de Counters e
+    união de conjuntos), pelo que o resultado não depende da divisão em blocos.
+    """
+    
+    COUNTERS = ['seniority', 'category', 'mode', 'companies', 'top_companies', 'cities',
+                'city_remote', 'city_category', 'tech_counts', 'tech_pairs']
+    # Counters indexados por pares, serializados como [a, b, n]
+    PAIR_COUNTERS = ['city_category', 'tech_pairs']
+    SCALARS = ['total', 'unique_positions', 'remote', 'senior', 'lisboa', 'porto']
+    
+    def __init__(self):
+        for name in self.SCALARS:
+            setattr(self, name, 0)
+        for name in self.COUNTERS:
+            setattr(self, name, Counter())
+        self.technologies = set()
+        self.tech_by_seniority = {level: set() for level in SENIORITY_LEVELS}
+    
+    def add_frame(self, df, unique_mask):
+        """Soma um DataFrame já pré-processado; unique_mask marca as posições únicas"""
+        unique = df[unique_mask]
+        is_remote = df['Modo_Principal'] == 'Remoto'
+        
+        self.total += len(df)
+        self.unique_positions += len(unique)
+        self.remote += int(is_remote.sum())
+        self.senior += int((df['Seniority'] == 'Senior').sum())
+        self.lisboa += int(df['Cidade_Principal'].str.contains('Lisboa', case=False, na=False).sum())
+        self.porto += int(df['Cidade_Principal'].str.contains('Porto', case=False, na=False).sum())
+        
+        self.seniority.update(_counts(df['Seniority']))
+        self.category.update(_counts(df['Categoria']))
+        self.mode.update(_counts(df['Modo_Principal']))
+        self.companies.update(_counts(df['Empresa']))
+        self.top_companies.update(_counts(unique['Empresa']))
+        self.cities.update(_counts(df['Cidade_Principal']))
+        self.city_remote.update(is_remote.groupby(df['Cidade_Principal'], observed=True).sum().to_dict())
+        self.city_category.update(
+            df.groupby(['Cidade_Principal', 'Categoria'], observed=True).size().to_dict()
+        )
+        
+        items = tech_items(df)
+        tech_df = pd.DataFrame({
+            'Tecnologia': items,
+            'Seniority': df['Seniority'].reindex(items.index),
+            'Unica': unique_mask.reindex(items.index),
+        })
+        self.technologies.update(tech_df['Tecnologia'].unique())
+        self.tech_counts.update(_counts(tech_df.loc[tech_df['Unica'], 'Tecnologia']))
+        self.tech_pairs.update(tech_cooccurrence(tech_df.loc[tech_df['Unica'], 'Tecnologia']))
+        for level, techs in tech_df.groupby('Seniority', observed=True)['Tecnologia'].unique().items():
+            if level in self.tech_by_seniority:
+                self.tech_by_seniority[level].update(techs)
+    
+    def merge(self, other):
+        """Combina outro agregado neste (associativo e comutativo)"""
+        for name in self.SCALARS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in self.COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+        self.technologies |= other.technologies
+        for level, techs in other.tech_by_seniority.items():
+            self.tech_by_seniority.setdefault(level, set()).update(techs)
+        return self
+    
+    def to_dict(self):
+        """Forma serializável (JSON) das contagens parciais"""
+        data = {name: getattr(self, name) for name in self.SCALARS}
+        for name in self.COUNTERS:
+            counter = getattr(self, name)
+            if name in self.PAIR_COUNTERS:
+                data[name] = [[a, b, int(n)] for (a, b), n in counter.items()]
+            else:
+                data[name] = {str(key): int(n) for key, n in counter.items()}
+        data['technologies'] = sorted(self.technologies)
+        data['tech_by_seniority'] = {level: sorted(techs) for level, techs in self.tech_by_seniority.items()}
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        for name in cls.SCALARS:
+            setattr(aggregates, name, data[name])
+        for name in cls.COUNTERS:
+            if name in cls.PAIR_COUNTERS:
+                # Rollups antigos não têm tech_pairs
+                setattr(aggregates, name, Counter({(a, b): n for a, b, n in data.get(name, [])}))
+            else:
+                setattr(aggregates, name, Counter(data[name]))
+        aggregates.technologies = set(data['technologies'])
+        aggregates.tech_by_seniority = {level: set(techs) for level, techs in data['tech_by_seniority'].items()}
+        return aggregates
+    
+    def to_stats(self):
+        """Agregados finais no formato usado pelas páginas do relatório"""
+        def pairs(counter, n=None):
+            return [[str(label), int(count)] for label, count in counter.most_common(n)]
+        
+        top_10_cities = [city for city, _ in self.cities.most_common(10)]
+        top_5_cities = top_10_cities[:5]
+        top_5_categories = [cat for cat, _ in self.category.most_common(5)]
+        total = self.total
+        
+        return {
+            'total_jobs': total,
+            'unique_positions': self.unique_positions,
+            'unique_companies': len(self.companies),
+            'unique_cities': len(self.cities),
+            'unique_technologies': len(self.technologies),
+            'remote_pct': self.remote / total * 100 if total else 0.0,
+            'senior_pct': self.senior / total * 100 if total else 0.0,
+            'seniority_counts': pairs(self.seniority),
+            'category_counts': pairs(self.category),
+            'mode_counts': pairs(self.mode),
+            'top_companies': pairs(self.top_companies, 10),
+            'top_cities': pairs(self.cities, 15),
+            'lisboa_porto_outras': [self.lisboa, self.porto, total - self.lisboa - self.porto],
+            'remote_by_city': [[str(city), self.city_remote[city] / self.cities[city] * 100]
+                               for city in top_10_cities],
+            'heatmap': {
+                'cities': [str(city) for city in top_5_cities],
+                'categories': [str(cat) for cat in top_5_categories],
+                'values': [[int(self.city_category[(city, cat)]) for cat in top_5_categories]
+                           for city in top_5_cities],
+            },
+            'tech_counts': pairs(self.tech_counts),
+            'tech_by_seniority': [[level, len(self.tech_by_seniority.get(level, ()))]
+                                  for level in SENIORITY_LEVELS],
+            'cooccurrence': self._cooccurrence_stats(),
+        }
+    
+    def _cooccurrence_stats(self, top_n=20, top_pairs=15, min_support=5):
+        """Matriz de co-ocorrência das top_n tecnologias e pares com maior afinidade"""
+        techs = [tech for tech, _ in self.tech_counts.most_common(top_n)]
+        index = {tech: i for i, tech in enumerate(techs)}
+        matrix = np.zeros((len(techs), len(techs)), dtype=int)
+        for (a, b), n in self.tech_pairs.items():
+            if a in index and b in index:
+                matrix[index[a], index[b]] = matrix[index[b], index[a]] = n
+        
+        affinity = tech_affinity(self.tech_counts, self.tech_pairs, self.unique_positions)
+        # Pares frequentes (suporte mínimo) ordenados por lift
+        frequent = affinity[affinity['n_ab'] >= min_support]
+        frequent = frequent.sort_values(['lift', 'n_ab'], ascending=False).head(top_pairs)
+        
+        return {
+            'technologies': [str(tech) for tech in techs],
+            'matrix': matrix.tolist(),
+            'pairs': [[str(row.a), str(row.b), int(row.n_ab), float(row.support),
+                       float(row.lift), float(row.pmi)] for row in frequent.itertuples()],
+            'min_support': min_support,
+        }
 
 class JobAnalyzer:
 
-    def __init__(self, csv_file):
+    def __init__(self, csv_file, cache_dir=None, chunksize=None, since=None):
         """Inicializa o analisador com o ficheiro CSV"""
         self.csv_file = csv_file
+        # Data limite (AAAA-MM-DD): só entram ofertas publicadas a partir dela
+        self.since = since
+        # Com chunksize, o CSV é agregado por blocos (ficheiros maiores que a memória)
+        self.chunksize = chunksize
+        # Cache de agregados, por defeito junto aos dados (data/.stats_cache)
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(csv_file) or '.', '.stats_cache')
         self.df = None
+        self.stats = None
+        self.aggregates = None
         self.report_name = f"relatorio_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         
     def load_data(self):
-        """Carrega e prepara os dados do CSV"""
+        """Carrega e prepara os dados do CSV (ou Parquet, só com as colunas usadas)"""
         print("A carregar dados do CSV...")
         try:
-            self.df = pd.read_csv(self.csv_file)
+            if self.csv_file.endswith('.parquet'):
+                import pyarrow.parquet as pq
+                available = pq.read_schema(self.csv_file).names
+                wanted = REPORT_COLUMNS + ['Cluster'] + ([DATE_COLUMN] if self.since else [])
+                columns = [col for col in wanted if col in available]
+                self.df = pd.read_parquet(self.csv_file, columns=columns)
+                # Tecnologias já vêm como coluna de listas (ver tech_items)
+                self.df['Tecnologias_Lista'] = self.df.pop('Tecnologias')
+            else:
+                self.df = pd.read_csv(self.csv_file, **self._csv_read_options())
             print(f"Dados carregados: {len(self.df)} ofertas de emprego")
             return True
         except Exception as e:
             print(f"Erro ao carregar CSV: {e}")
             return False
     
+    def _csv_read_options(self):
+        """Leitura projetada e tipada: só as colunas usadas, categóricas como `category`"""
+        wanted = set(REPORT_COLUMNS) | {'Cluster', 'Modo'}
+        if self.since:
+            wanted.add(DATE_COLUMN)
+        return {
+            'usecols': lambda col: col in wanted,
+            'dtype': {col: 'category' for col in CATEGORY_COLUMNS},
+        }
+    
     def preprocess_data(self):
         """Pré-processa os dados para análise"""
         print("A processar dados...")
         
-        # Remove valores N/A e limpa dados
-        self.df = self.df.replace('N/A', pd.NA)
+        # As contagens (posições únicas, tecnologias) são feitas em compute_aggregates
+        self.df = self._prepare_frame(self.df)
         
-        # Processa tecnologias (separa por vírgula)
-        self.df['Tecnologias_Lista'] = self.df['Tecnologias'].apply(
-            lambda x: [tech.strip() for tech in str(x).split(',') if tech.strip() != 'nan'] if pd.notna(x) else []
-        )
+        print("Dados processados com sucesso")
+    
+    def _prepare_frame(self, df):
+        """Limpa um DataFrame (ou bloco) e acrescenta as colunas derivadas"""
+        if self.since:
+            df = self._filter_since(df)
+        
+        # Remove valores N/A e limpa dados (a coluna de listas do Parquet fica de fora)
+        df = df.replace({col: {'N/A': pd.NA} for col in df.columns if col != 'Tecnologias_Lista'})
+        for col in df.select_dtypes('category').columns:
+            df[col] = df[col].cat.remove_unused_categories()
         
         # Processa localização (primeira cidade mencionada)
-        self.df['Cidade_Principal'] = self.df['Localização'].apply(
-            lambda x: str(x).split(',')[0].strip() if pd.notna(x) else 'Não especificado'
-        )
+        df['Cidade_Principal'] = self._first_item(df['Localização'])
         
         modo_col = None
-        if 'Modo de trabalho' in self.df.columns:
+        if 'Modo de trabalho' in df.columns:
             modo_col = 'Modo de trabalho'
-        elif 'Modo' in self.df.columns:
+        elif 'Modo' in df.columns:
             modo_col = 'Modo'
         
         if modo_col:
-            self.df['Modo_Principal'] = self.df[modo_col].apply(
-                lambda x: str(x).split(',')[0].strip() if pd.notna(x) else 'Não especificado'
-            )
+            df['Modo_Principal'] = self._first_item(df[modo_col])
         else:
-            self.df['Modo_Principal'] = 'Não especificado'
+            df['Modo_Principal'] = 'Não especificado'
             print("Coluna 'Modo' não encontrada - usando valor padrão")
         
-        print("Dados processados com sucesso")
+        return df
     
-    def create_overview_stats(self, pdf):
-        """Cria página de estatísticas gerais"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('Visão Geral das Ofertas de Emprego', fontsize=20, fontweight='bold')
-        
-        # 1. Distribuição por Seniority
-        seniority_counts = self.df['Seniority'].value_counts()
-        ax1.pie(seniority_counts.values, labels=seniority_counts.index, autopct='%1.1f%%', startangle=90)
-        ax1.set_title('Distribuição por Nível de Seniority', fontweight='bold')
-        
-        # 2. Top 10 Empresas
-        top_companies = self.df['Empresa'].value_counts().head(10)
-        ax2.barh(top_companies.index[::-1], top_companies.values[::-1], color='skyblue')
-        ax2.set_title('Top 10 Empresas com Mais Ofertas', fontweight='bold')
-        ax2.set_xlabel('Número de Ofertas')
+    def _filter_since(self, df):
+        """Só as ofertas com data de publicação normalizada igual ou posterior a `since`"""
+        if DATE_COLUMN not in df.columns:
+            print(f"Coluna '{DATE_COLUMN}' não encontrada - filtro --since ignorado")
+            return df
+        dates = df.pop(DATE_COLUMN).astype('string').fillna('')
+        keep = dates.str.fullmatch(r'\d{4}-\d{2}-\d{2}') & (dates >= self.since)
+        return df[keep.to_numpy(dtype=bool)].reset_index(drop=True)
+    
+    @staticmethod
+    def _unique_mask(df, seen_clusters=None):
+        """
+        Máscara das posições únicas (primeira linha de cada Cluster).
+        Com `seen_clusters`, também exclui clusters vistos em blocos anteriores
+        (os ids são estáveis entre runs, por isso vale também para históricos).
+        """
+        if 'Cluster' not in df.columns:
+            return pd.Series(True, index=df.index)
         
-        # 3. Distribuição por Categoria
-        category_counts = self.df['Categoria'].value_counts()
-        ax3.bar(range(len(category_counts)), category_counts.values, color='lightcoral')
-        ax3.set_title('Distribuição por Categoria Profissional', fontweight='bold')
-        ax3.set_xticks(range(len(category_counts)))
-        ax3.set_xticklabels(category_counts.index, rotation=45, ha='right')
-        ax3.set_ylabel('Número de Ofertas')
+        clusters = df['Cluster']
+        duplicated = clusters.notna() & clusters.duplicated()
+        if seen_clusters is not None:
+            duplicated |= clusters.isin(seen_clusters)
+            seen_clusters.update(clusters.dropna().unique())
+        return ~duplicated
+    
+    @staticmethod
+    def _first_item(series):
+        """Primeiro elemento de uma lista separada por vírgulas (operação vetorizada)"""
+        return (series.astype('string').str.split(',', n=1).str[0].str.strip()
+                .fillna('Não especificado'))
+    
+    def compute_aggregates(self):
+        """
+        Calcula todas as contagens usadas pelas páginas do relatório.
+        O resultado só contém listas e números (serializável), pelo que pode
+        ser enviado para processos de renderização.
+        """
+        self.aggregates = ReportAggregates()
+        self.aggregates.add_frame(self.df, self._unique_mask(self.df))
+        self.stats = self.aggregates.to_stats()
+        return self.stats
+    
+    def compute_aggregates_chunked(self, chunksize=100_000):
+        """
+        Calcula os agregados lendo o CSV por blocos de `chunksize` linhas
+        (só as colunas usadas, campos categóricos como `category`), sem
+        nunca ter o ficheiro completo em memória.
+        """
+        print(f"A processar o CSV por blocos de {chunksize:,} linhas...")
+        aggregates = ReportAggregates()
+        seen_clusters = set()
         
-        # 4. Modo de Trabalho
-        mode_counts = self.df['Modo_Principal'].value_counts()
-        colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
-        ax4.pie(mode_counts.values, labels=mode_counts.index, autopct='%1.1f%%', 
-                startangle=90, colors=colors[:len(mode_counts)])
-        ax4.set_title('Modo de Trabalho', fontweight='bold')
+        for chunk in pd.read_csv(self.csv_file, chunksize=chunksize, **self._csv_read_options()):
+            chunk = self._prepare_frame(chunk)
+            unique_mask = self._unique_mask(chunk, seen_clusters)
+            aggregates.add_frame(chunk, unique_mask)
         
-        plt.tight_layout()
+        print(f"Dados processados: {aggregates.total:,} ofertas de emprego")
+        self.aggregates = aggregates
+        self.stats = aggregates.to_stats()
+        return self.stats
+    
+    def _save_page(self, pdf, renderer):
+        fig = renderer(self.stats)
         pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        plt.close(fig)
+    
+    def create_overview_stats(self, pdf):
+        """Cria página de estatísticas gerais"""
+        self._save_page(pdf, render_overview_stats)
     
     def create_location_analysis(self, pdf):
         """Análise por localização"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('  Análise por Localização', fontsize=20, fontweight='bold')
-        
-        # 1. Top 15 Cidades
-        top_cities = self.df['Cidade_Principal'].value_counts().head(15)
-        ax1.barh(top_cities.index[::-1], top_cities.values[::-1], color='lightgreen')
-        ax1.set_title('Top 15 Cidades com Mais Ofertas', fontweight='bold')
-        ax1.set_xlabel('Número de Ofertas')
-        
-        # 2. Distribuição Lisboa vs Porto vs Outras
-        lisboa_count = self.df[self.df['Cidade_Principal'].str.contains('Lisboa', case=False, na=False)].shape[0]
-        porto_count = self.df[self.df['Cidade_Principal'].str.contains('Porto', case=False, na=False)].shape[0]
-        outras_count = len(self.df) - lisboa_count - porto_count
-        
-        ax2.pie([lisboa_count, porto_count, outras_count], 
-                labels=['Lisboa', 'Porto', 'Outras'], 
-                autopct='%1.1f%%', startangle=90)
-        ax2.set_title('Lisboa vs Porto vs Outras Cidades', fontweight='bold')
-        
-        # 3. Modo de trabalho por cidade (top 10 cidades)
-        top_10_cities = self.df['Cidade_Principal'].value_counts().head(10).index
-        city_mode_data = []
-        for city in top_10_cities:
-            city_data = self.df[self.df['Cidade_Principal'] == city]
-            remote_pct = (city_data['Modo_Principal'] == 'Remoto').sum() / len(city_data) * 100
-            city_mode_data.append((city, remote_pct))
-        
-        cities, remote_percentages = zip(*city_mode_data)
-        ax3.bar(range(len(cities)), remote_percentages, color='orange')
-        ax3.set_title('% de Trabalho Remoto por Cidade (Top 10)', fontweight='bold')
-        ax3.set_xticks(range(len(cities)))
-        ax3.set_xticklabels(cities, rotation=45, ha='right')
-        ax3.set_ylabel('% Trabalho Remoto')
-        
-        # 4. Heatmap de categorias por cidade (top 5 cidades e categorias)
-        top_5_cities = self.df['Cidade_Principal'].value_counts().head(5).index
-        top_5_categories = self.df['Categoria'].value_counts().head(5).index
-        
-        heatmap_data = []
-        for city in top_5_cities:
-            city_row = []
-            for category in top_5_categories:
-                count = len(self.df[(self.df['Cidade_Principal'] == city) & 
-                                  (self.df['Categoria'] == category)])
-                city_row.append(count)
-            heatmap_data.append(city_row)
-        
-        sns.heatmap(heatmap_data, annot=True, fmt='d', 
-                   xticklabels=[cat[:15] + '...' if len(cat) > 15 else cat for cat in top_5_categories],
-                   yticklabels=top_5_cities, ax=ax4, cmap='YlOrRd')
-        ax4.set_title('Ofertas por Cidade vs Categoria', fontweight='bold')
-        
-        plt.tight_layout()
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        self._save_page(pdf, render_location_analysis)
     
     def create_technology_analysis(self, pdf):
         """Análise de tecnologias"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('   Análise de Tecnologias', fontsize=20, fontweight='bold')
-        
-        # Extrai todas as tecnologias
-        all_technologies = []
-        for tech_list in self.df['Tecnologias_Lista']:
-            all_technologies.extend(tech_list)
+        self._save_page(pdf, render_technology_analysis)
+    
+    def create_cooccurrence_analysis(self, pdf):
+        """Co-ocorrência e afinidade entre tecnologias"""
+        self._save_page(pdf, render_cooccurrence_analysis)
+    
+    def create_summary_statistics(self, pdf):
+        """Página de estatísticas resumo"""
+        self._save_page(pdf, render_summary_statistics)
+    
+    def _render_pages_parallel(self, workers=None):
+        """
+        Renderiza cada página num processo separado (backend Agg) para um PDF
+        temporário e junta-os pela ordem de REPORT_PAGES. Requer pypdf.
+        """
+        from pypdf import PdfWriter
         
-        tech_counter = Counter(all_technologies)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jobs = [(name, self.stats, os.path.join(tmp_dir, f"{i:02d}_{name}.pdf"))
+                    for i, (name, _) in enumerate(REPORT_PAGES)]
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                page_files = list(executor.map(_render_page_to_file, jobs))
+            
+            writer = PdfWriter()
+            for page_file in page_files:
+                writer.append(page_file)
+            with open(self.report_name, 'wb') as f:
+                writer.write(f)
+    
+    def _cache_path(self, fingerprint):
+        suffix = f"_since{self.since}" if self.since else ""
+        return os.path.join(self.cache_dir, f"stats_{fingerprint[:32]}{suffix}.json")
+    
+    def load_stats(self, use_cache=True):
+        """
+        Obtém os agregados: da cache se o ficheiro de dados não mudou (mesmo
+        SHA-256), senão lê, processa e calcula tudo e guarda na cache.
+        """
+        fingerprint = dataset_fingerprint(self.csv_file)
+        cache_path = self._cache_path(fingerprint)
         
-        # 1. Top 20 Tecnologias Mais Procuradas
-        top_20_techs = dict(tech_counter.most_common(20))
-        ax1.barh(list(top_20_techs.keys())[::-1], list(top_20_techs.values())[::-1], color='mediumpurple')
-        ax1.set_title('Top 20 Tecnologias Mais Procuradas', fontweight='bold')
-        ax1.set_xlabel('Número de Ofertas')
+        if use_cache and os.path.exists(cache_path):
+            with open(cache_path, encoding='utf-8') as f:
+                self.stats = json.load(f)
+            print(f"Agregados carregados da cache: {cache_path}")
+            return True
         
-        # 2. Linguagens de Programação vs Frameworks vs Ferramentas
-        programming_langs = ['Python', 'JavaScript', 'Java', 'C#', 'PHP', 'TypeScript', 'Go', 'Ruby', 'Swift', 'Kotlin']
-        frameworks = ['React', 'Angular', 'Vue', 'Django', 'Flask', 'Spring', 'Laravel', '.NET', 'Node.js']
-        tools = ['Docker', 'Kubernetes', 'Git', 'Jenkins', 'AWS', 'Azure', 'Google Cloud']
+        if self.chunksize and not self.csv_file.endswith('.parquet'):
+            self.compute_aggregates_chunked(self.chunksize)
+        else:
+            if not self.load_data():
+                return False
+            self.preprocess_data()
+            self.compute_aggregates()
         
-        lang_count = sum(tech_counter[lang] for lang in programming_langs if lang in tech_counter)
-        framework_count = sum(tech_counter[fw] for fw in frameworks if fw in tech_counter)
-        tools_count = sum(tech_counter[tool] for tool in tools if tool in tech_counter)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        return True
+    
+    def save_rollup(self, rollup_dir=ROLLUP_DIR, crawl_date=None):
+        """
+        Guarda os agregados parciais deste crawl em rollup_<data>.json (com
+        --since, rollup_<data>_since<AAAA-MM-DD>.json). A data é, por defeito,
+        a da última modificação do ficheiro de dados; um novo rollup da mesma
+        data e filtro substitui o anterior.
+        """
+        if self.chunksize and not self.csv_file.endswith('.parquet'):
+            self.compute_aggregates_chunked(self.chunksize)
+        else:
+            if not self.load_data():
+                return None
+            self.preprocess_data()
+            self.compute_aggregates()
         
-        ax2.pie([lang_count, framework_count, tools_count], 
-                labels=['Linguagens', 'Frameworks', 'Ferramentas'],
-                autopct='%1.1f%%', startangle=90)
-        ax2.set_title('Distribuição: Linguagens vs Frameworks vs Ferramentas', fontweight='bold')
+        crawl_date = crawl_date or datetime.fromtimestamp(os.path.getmtime(self.csv_file)).strftime('%Y-%m-%d')
+        suffix = f"_since{self.since}" if self.since else ""
         
-        # 3. Tecnologias por Seniority Level
-        seniority_levels = ['Junior', 'Mid-level', 'Senior', 'Lead']
-        tech_by_seniority = {level: [] for level in seniority_levels}
+        os.makedirs(rollup_dir, exist_ok=True)
+        path = os.path.join(rollup_dir, f"rollup_{crawl_date}{suffix}.json")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'date': crawl_date, 'since': self.since, 'source': os.path.basename(self.csv_file),
+                       'aggregates': self.aggregates.to_dict()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        print(f"Rollup guardado: {path}")
+        return path
+    
+    def export_stats_json(self, path):
+        """Exporta os agregados do relatório em JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        print(f"Estatísticas exportadas: {path}")
+    
+    def generate_report(self, parallel=False, workers=None, use_cache=True, profiler=None):
+        """Gera o relatório PDF completo (com `profiler`, perfila agregados e renderização)"""
+        stage = profiler.stage if profiler else (lambda name: nullcontext())
         
-        for level in seniority_levels:
-            level_data = self.df[self.df['Seniority'] == level]
-            level_techs = []
-            for tech_list in level_data['Tecnologias_Lista']:
-                level_techs.extend(tech_list)
-            tech_by_seniority[level] = len(set(level_techs))  # Tecnologias únicas
+        with stage("aggregates"):
+            loaded = self.load_stats(use_cache=use_cache)
+        if not loaded:
+            return False
         
-        ax3.bar(tech_by_seniority.keys(), tech_by_seniority.values(), color='lightblue')
-        ax3.set_title('Diversidade de Tecnologias por Nível', fontweight='bold')
-        ax3.set_ylabel('Número de Tecnologias Únicas')
+        print(f"   A gerar relatório PDF: {self.report_name}")
         
-        # 4. Cloud Technologies
-        cloud_techs = ['AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Terraform']
-        cloud_counts = [tech_counter.get(tech, 0) for tech in cloud_techs]
+        if parallel:
+            try:
+                import pypdf  # noqa: F401
+            except ImportError:
+                print("pypdf não está instalado - a renderizar as páginas sequencialmente")
+                parallel = False
         
-        ax4.bar(cloud_techs, cloud_counts, color='lightcyan')
-        ax4.set_title('Tecnologias Cloud/DevOps', fontweight='bold')
-        ax4.set_ylabel('Número de Ofertas')
-        ax4.tick_params(axis='x', rotation=45)
+        with stage("render"):
+            load_plotting()
+            if parallel:
+                self._render_pages_parallel(workers)
+            else:
+                with PdfPages(self.report_name) as pdf:
+                    # Página 1: Resumo Executivo
+                    self.create_summary_statistics(pdf)
+                
+                    # Página 2: Visão Geral
+                    self.create_overview_stats(pdf)
+                
+                    # Página 3: Análise por Localização
+                    self.create_location_analysis(pdf)
+                
+                    # Página 4: Análise de Tecnologias
+                    self.create_technology_analysis(pdf)
+                
+                    # Página 5: Tecnologias Pedidas em Conjunto
+                    self.create_cooccurrence_analysis(pdf)
         
-        plt.tight_layout()
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        print(f"  Relatório gerado com sucesso: {self.report_name}")
+        print(f"   Localização: {os.path.abspath(self.report_name)}")
+        return True
+
+
+def render_overview_stats(stats):
+    """Página de estatísticas gerais (a partir dos agregados)"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Visão Geral das Ofertas de Emprego', fontsize=20, fontweight='bold')
     
-    def create_summary_statistics(self, pdf):
-        """Página de estatísticas resumo"""
-        fig, ax = plt.subplots(figsize=(16, 12))
-        ax.axis('off')
-        
-        # Estatísticas gerais
-        total_jobs = len(self.df)
-        unique_companies = self.df['Empresa'].nunique()
-        unique_cities = self.df['Cidade_Principal'].nunique()
-        
-        # Tecnologias
-        all_techs = []
-        for tech_list in self.df['Tecnologias_Lista']:
-            all_techs.extend(tech_list)
-        unique_technologies = len(set(all_techs))
-        
-        # Percentagens
-        remote_pct = (self.df['Modo_Principal'] == 'Remoto').sum() / total_jobs * 100
-        senior_pct = (self.df['Seniority'] == 'Senior').sum() / total_jobs * 100
-        
-        # Cria texto do resumo
-        summary_text = f"""
+    # 1. Distribuição por Seniority
+    labels, values = _unzip(stats['seniority_counts'])
+    ax1.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax1.set_title('Distribuição por Nível de Seniority', fontweight='bold')
+    
+    # 2. Top 10 Empresas
+    labels, values = _unzip(stats['top_companies'])
+    ax2.barh(labels[::-1], values[::-1], color='skyblue')
+    ax2.set_title('Top 10 Empresas com Mais Ofertas', fontweight='bold')
+    ax2.set_xlabel('Número de Ofertas')
+    
+    # 3. Distribuição por Categoria
+    labels, values = _unzip(stats['category_counts'])
+    ax3.bar(range(len(values)), values, color='lightcoral')
+    ax3.set_title('Distribuição por Categoria Profissional', fontweight='bold')
+    ax3.set_xticks(range(len(values)))
+    ax3.set_xticklabels(labels, rotation=45, ha='right')
+    ax3.set_ylabel('Número de Ofertas')
+    
+    # 4. Modo de Trabalho
+    labels, values = _unzip(stats['mode_counts'])
+    colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
+    ax4.pie(values, labels=labels, autopct='%1.1f%%', 
+            startangle=90, colors=colors[:len(values)])
+    ax4.set_title('Modo de Trabalho', fontweight='bold')
+    
+    plt.tight_layout()
+    return fig
+
+def render_location_analysis(stats):
+    """Página de análise por localização (a partir dos agregados)"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('  Análise por Localização', fontsize=20, fontweight='bold')
+    
+    # 1. Top 15 Cidades
+    labels, values = _unzip(stats['top_cities'])
+    ax1.barh(labels[::-1], values[::-1], color='lightgreen')
+    ax1.set_title('Top 15 Cidades com Mais Ofertas', fontweight='bold')
+    ax1.set_xlabel('Número de Ofertas')
+    
+    # 2. Distribuição Lisboa vs Porto vs Outras
+    ax2.pie(stats['lisboa_porto_outras'], 
+            labels=['Lisboa', 'Porto', 'Outras'], 
+            autopct='%1.1f%%', startangle=90)
+    ax2.set_title('Lisboa vs Porto vs Outras Cidades', fontweight='bold')
+    
+    # 3. Modo de trabalho por cidade (top 10 cidades)
+    cities, remote_percentages = _unzip(stats['remote_by_city'])
+    ax3.bar(range(len(cities)), remote_percentages, color='orange')
+    ax3.set_title('% de Trabalho Remoto por Cidade (Top 10)', fontweight='bold')
+    ax3.set_xticks(range(len(cities)))
+    ax3.set_xticklabels(cities, rotation=45, ha='right')
+    ax3.set_ylabel('% Trabalho Remoto')
+    
+    # 4. Heatmap de categorias por cidade (top 5 cidades e categorias)
+    heatmap = stats['heatmap']
+    sns.heatmap(heatmap['values'], annot=True, fmt='d', 
+               xticklabels=[cat[:15] + '...' if len(cat) > 15 else cat for cat in heatmap['categories']],
+               yticklabels=heatmap['cities'], ax=ax4, cmap='YlOrRd')
+    ax4.set_title('Ofertas por Cidade vs Categoria', fontweight='bold')
+    
+    plt.tight_layout()
+    return fig
+
+def render_technology_analysis(stats):
+    """Página de análise de tecnologias (a partir dos agregados)"""
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('   Análise de Tecnologias', fontsize=20, fontweight='bold')
+    
+    tech_counts = dict(stats['tech_counts'])
+    
+    # 1. Top 20 Tecnologias Mais Procuradas
+    labels, values = _unzip(stats['tech_counts'][:20])
+    ax1.barh(labels[::-1], values[::-1], color='mediumpurple')
+    ax1.set_title('Top 20 Tecnologias Mais Procuradas', fontweight='bold')
+    ax1.set_xlabel('Número de Ofertas')
+    
+    # 2. Linguagens de Programação vs Frameworks vs Ferramentas
+    programming_langs = ['Python', 'JavaScript', 'Java', 'C#', 'PHP', 'TypeScript', 'Go', 'Ruby', 'Swift', 'Kotlin']
+    frameworks = ['React', 'Angular', 'Vue', 'Django', 'Flask', 'Spring', 'Laravel', '.NET', 'Node.js']
+    tools = ['Docker', 'Kubernetes', 'Git', 'Jenkins', 'AWS', 'Azure', 'Google Cloud']
+    
+    lang_count = sum(tech_counts.get(lang, 0) for lang in programming_langs)
+    framework_count = sum(tech_counts.get(fw, 0) for fw in frameworks)
+    tools_count = sum(tech_counts.get(tool, 0) for tool in tools)
+    
+    ax2.pie([lang_count, framework_count, tools_count], 
+            labels=['Linguagens', 'Frameworks', 'Ferramentas'],
+            autopct='%1.1f%%', startangle=90)
+    ax2.set_title('Distribuição: Linguagens vs Frameworks vs Ferramentas', fontweight='bold')
+    
+    # 3. Tecnologias por Seniority Level
+    labels, values = _unzip(stats['tech_by_seniority'])
+    ax3.bar(labels, values, color='lightblue')
+    ax3.set_title('Diversidade de Tecnologias por Nível', fontweight='bold')
+    ax3.set_ylabel('Número de Tecnologias Únicas')
+    
+    # 4. Cloud Technologies
+    cloud_techs = ['AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Terraform']
+    cloud_counts = [tech_counts.get(tech, 0) for tech in cloud_techs]
+    
+    ax4.bar(cloud_techs, cloud_counts, color='lightcyan')
+    ax4.set_title('Tecnologias Cloud/DevOps', fontweight='bold')
+    ax4.set_ylabel('Número de Ofertas')
+    ax4.tick_params(axis='x', rotation=45)
+    
+    plt.tight_layout()
+    return fig
+
+def render_cooccurrence_analysis(stats):
+    """Página de co-ocorrência de tecnologias (a partir dos agregados)"""
+    cooc = stats['cooccurrence']
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10), gridspec_kw={'width_ratios': [1.2, 1]})
+    fig.suptitle('   Tecnologias Pedidas em Conjunto', fontsize=20, fontweight='bold')
+    
+    # 1. Heatmap de co-ocorrência das tecnologias mais procuradas
+    if cooc['technologies']:
+        matrix = pd.DataFrame(cooc['matrix'], index=cooc['technologies'], columns=cooc['technologies'])
+        mask = np.eye(len(matrix), dtype=bool)
+        sns.heatmap(matrix, mask=mask, cmap='YlOrRd', ax=ax1, square=True,
+                    cbar_kws={'label': 'Ofertas com ambas'})
+    ax1.set_title(f"Co-ocorrência (Top {len(cooc['technologies'])} Tecnologias)", fontweight='bold')
+    
+    # 2. Pares com maior afinidade (lift) entre os pares frequentes
+    ax2.axis('off')
+    ax2.set_title(f"Competências Frequentemente Pedidas em Conjunto (≥ {cooc['min_support']} ofertas)",
+                  fontweight='bold')
+    if cooc['pairs']:
+        rows = [[f"{a} + {b}", f"{n:,}", f"{support:.1f}%", f"{lift:.2f}", f"{pmi:.2f}"]
+                for a, b, n, support, lift, pmi in cooc['pairs']]
+        table = ax2.table(cellText=rows, colLabels=['Par', 'Ofertas', 'Suporte', 'Lift', 'PMI'],
+                          loc='upper center', cellLoc='center', colWidths=[0.44, 0.14, 0.14, 0.14, 0.14])
+        table.auto_set_font_size(False)
+        table.set_fontsize(10)
+        table.scale(1, 1.6)
+    else:
+        ax2.text(0.5, 0.5, 'Sem pares suficientes', ha='center', va='center', fontsize=14)
+    
+    plt.tight_layout()
+    return fig
+
+def render_summary_statistics(stats):
+    """Página de estatísticas resumo (a partir dos agregados)"""
+    fig, ax = plt.subplots(figsize=(16, 12))
+    ax.axis('off')
+    
+    # Os sketches contam links distintos; os agregados exatos, posições sem duplicados
+    if 'unique_positions' in stats:
+        unique_line = f"Posições Únicas (sem duplicados): {stats['unique_positions']:,}"
+    else:
+        unique_line = f"Links distintos: {stats['distinct_links']:,}"
+    
+    # Cria texto do resumo
+    summary_text = f"""
    RELATÓRIO ESTATÍSTICO - OFERTAS DE EMPREGO IT EM PORTUGAL
 ═══════════════════════════════════════════════════════════════
 
    ESTATÍSTICAS GERAIS
 ────────────────────────────
-• Total de Ofertas Analisadas: {total_jobs:,}
-• Empresas Únicas: {unique_companies:,}
-• Cidades/Localizações: {unique_cities:,}
-• Tecnologias Identificadas: {unique_technologies:,}
+• Total de Ofertas Analisadas: {stats['total_jobs']:,}
+• {unique_line}
+• Empresas Únicas: {stats['unique_companies']:,}
+• Cidades/Localizações: {stats['unique_cities']:,}
+• Tecnologias Identificadas: {stats['unique_technologies']:,}
 
    TOP 5 EMPRESAS
 ────────────────────────────
 """
-        
-        # Add top 5 companies
-        top_companies = self.df['Empresa'].value_counts().head(5)
-        for i, (company, count) in enumerate(top_companies.items(), 1):
-            summary_text += f"  {i}. {company}: {count} ofertas\n"
-        
-        summary_text += f"""
+    
+    # Add top 5 companies
+    for i, (company, count) in enumerate(stats['top_companies'][:5], 1):
+        summary_text += f"  {i}. {company}: {count} ofertas\n"
+    
+    summary_text += f"""
    TOP 5 CIDADES
 ────────────────────────────
 """
-        
-        # Add top 5 cities
-        top_cities = self.df['Cidade_Principal'].value_counts().head(5)
-        for i, (city, count) in enumerate(top_cities.items(), 1):
-            summary_text += f"  {i}. {city}: {count} ofertas\n"
-        
-        summary_text += f"""
+    
+    # Add top 5 cities
+    for i, (city, count) in enumerate(stats['top_cities'][:5], 1):
+        summary_text += f"  {i}. {city}: {count} ofertas\n"
+    
+    summary_text += f"""
    TOP 10 TECNOLOGIAS
 ────────────────────────────
 """
-        
-        # Add top 10 technologies
-        all_technologies = []
-        for tech_list in self.df['Tecnologias_Lista']:
-            all_technologies.extend(tech_list)
-        tech_counter = Counter(all_technologies)
-        
-        for i, (tech, count) in enumerate(tech_counter.most_common(10), 1):
-            summary_text += f"  {i}. {tech}: {count} ofertas\n"
-        
-        # Adiciona o texto à página
-        ax.text(0.05, 0.95, summary_text, transform=ax.transAxes, fontsize=12,
-                verticalalignment='top', fontfamily='monospace',
-                bbox=dict(boxstyle="round,pad=1", facecolor="lightgray", alpha=0.8))
-        
-        plt.title('RESUMO EXECUTIVO', fontsize=24, fontweight='bold', pad=20)
-        
+    
+    # Add top 10 technologies
+    for i, (tech, count) in enumerate(stats['tech_counts'][:10], 1):
+        summary_text += f"  {i}. {tech}: {count} ofertas\n"
+    
+    # Valores estimados por sketches (StreamingStats)
+    if stats.get('approximate'):
+        bounds = stats['error_bounds']
+        summary_text += f"""
+   VALORES APROXIMADOS
+────────────────────────────
+• Contagens de distintos: erro relativo típico ±{bounds['distinct_relative']:.1%}
+• Tops: contagens sobrestimadas no máximo em {bounds['top_companies_abs']:.0f} (empresas),
+  {bounds['top_cities_abs']:.0f} (cidades) e {bounds['top_technologies_abs']:.0f} (tecnologias)
+"""
+    
+    # Adiciona o texto à página
+    ax.text(0.05, 0.95, summary_text, transform=ax.transAxes, fontsize=12,
+            verticalalignment='top', fontfamily='monospace',
+            bbox=dict(boxstyle="round,pad=1", facecolor="lightgray", alpha=0.8))
+    
+    plt.title('RESUMO EXECUTIVO', fontsize=24, fontweight='bold', pad=20)
+    return fig
+
+def _unzip(pairs):
+    """[[label, valor], ...] -> (labels, valores)"""
+    return [label for label, _ in pairs], [value for _, value in pairs]
+
+# Páginas do relatório, pela ordem em que aparecem no PDF
+REPORT_PAGES = [
+    ('resumo', render_summary_statistics),
+    ('visao_geral', render_overview_stats),
+    ('localizacao', render_location_analysis),
+    ('tecnologias', render_technology_analysis),
+    ('coocorrencia', render_cooccurrence_analysis),
+]
+
+def _render_page_to_file(job):
+    """Worker: renderiza uma página (backend Agg) para um PDF próprio"""
+    name, stats, path = job
+    load_plotting('Agg')
+    renderer = dict(REPORT_PAGES)[name]
+    fig = renderer(stats)
+    with PdfPages(path) as pdf:
         pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+    plt.close(fig)
+    return path
+
+def load_rollups(rollup_dir=ROLLUP_DIR, since=None):
+    """
+    Lê os rollups com o filtro `since` indicado: {data: ReportAggregates}.
+    Cada data conta uma só vez: se houver vários rollups da mesma data
+    (p. ex. de versões antigas), fica o mais recente.
+    """
+    by_date = {}
+    if not os.path.exists(rollup_dir):
+        return by_date
+    paths = [os.path.join(rollup_dir, name) for name in os.listdir(rollup_dir)
+             if name.startswith('rollup_') and name.endswith('.json')]
+    for path in sorted(paths, key=os.path.getmtime):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('since') != since:
+            continue
+        by_date[data['date']] = ReportAggregates.from_dict(data['aggregates'])
+    return dict(sorted(by_date.items()))
+
+def render_trend_analysis(rollups, top_n=8):
+    """Página de tendências ao longo dos crawls (a partir dos rollups)"""
+    dates = pd.to_datetime(list(rollups.keys()))
+    aggregates = list(rollups.values())
     
-    def generate_report(self):
-        """Gera o relatório PDF completo"""
-        if not self.load_data():
-            return False
-        
-        self.preprocess_data()
-        
-        print(f"   A gerar relatório PDF: {self.report_name}")
-        
-        with PdfPages(self.report_name) as pdf:
-            # Página 1: Resumo Executivo
-            self.create_summary_statistics(pdf)
-            
-            # Página 2: Visão Geral
-            self.create_overview_stats(pdf)
-            
-            # Página 3: Análise por Localização
-            self.create_location_analysis(pdf)
-            
-            # Página 4: Análise de Tecnologias
-            self.create_technology_analysis(pdf)
-        
-        print(f"  Relatório gerado com sucesso: {self.report_name}")
-        print(f"   Localização: {os.path.abspath(self.report_name)}")
-        return True
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('   Tendências ao Longo do Tempo', fontsize=20, fontweight='bold')
+    
+    # 1. Procura das tecnologias mais frequentes (% das posições únicas)
+    overall = Counter()
+    for agg in aggregates:
+        overall.update(agg.tech_counts)
+    for tech, _ in overall.most_common(top_n):
+        share = [agg.tech_counts.get(tech, 0) / agg.unique_positions * 100 if agg.unique_positions else 0
+                 for agg in aggregates]
+        ax1.plot(dates, share, marker='o', label=tech)
+    ax1.set_title(f'Top {top_n} Tecnologias (% das Posições)', fontweight='bold')
+    ax1.set_ylabel('% das Posições')
+    ax1.legend(fontsize=8)
+    
+    # 2. Trabalho remoto
+    remote_share = [agg.remote / agg.total * 100 if agg.total else 0 for agg in aggregates]
+    ax2.plot(dates, remote_share, marker='o', color='orange')
+    ax2.set_title('% de Trabalho Remoto', fontweight='bold')
+    ax2.set_ylabel('% Trabalho Remoto')
+    
+    # 3. Mix de seniority
+    mix = pd.DataFrame([{level: agg.seniority.get(level, 0) for level in SENIORITY_LEVELS}
+                        for agg in aggregates], index=dates)
+    mix = mix.div(mix.sum(axis=1).replace(0, 1), axis=0) * 100
+    ax3.stackplot(dates, mix.T.values, labels=mix.columns)
+    ax3.set_title('Mix de Seniority (%)', fontweight='bold')
+    ax3.legend(loc='upper left', fontsize=8)
+    
+    # 4. Volume de ofertas
+    ax4.bar(dates, [agg.total for agg in aggregates], color='skyblue')
+    ax4.set_title('Ofertas por Crawl', fontweight='bold')
+    ax4.set_ylabel('Número de Ofertas')
+    
+    for ax in (ax1, ax2, ax3, ax4):
+        ax.tick_params(axis='x', rotation=45)
+    
+    plt.tight_layout()
+    return fig
 
-def main():
-    """Função principal"""
-    print("Gerador de Relatório Estatístico - JobScraper Portugal")
-    print("=" * 60)
+def generate_trend_report(rollup_dir=ROLLUP_DIR, report_name=None, since=None):
+    """Relatório de tendências só a partir dos rollups (sem ler CSVs)"""
+    rollups = load_rollups(rollup_dir, since=since)
+    if not rollups:
+        print(f"Nenhum rollup encontrado em {rollup_dir}")
+        return False
+    
+    report_name = report_name or f"relatorio_tendencias_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    print(f"   A gerar relatório de tendências ({len(rollups)} datas): {report_name}")
+    load_plotting()
+    with PdfPages(report_name) as pdf:
+        fig = render_trend_analysis(rollups)
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close(fig)
+    
+    print(f"  Relatório gerado com sucesso: {report_name}")
+    return True
+
+def generate_approx_report(sketch_file, report_name=None):
+    """Página de resumo só a partir do estado dos sketches (StreamingStats)"""
+    from core.sketches import StreamingStats
+    
+    if not os.path.exists(sketch_file):
+        print(f"Ficheiro de sketches não encontrado: {sketch_file}")
+        return False
+    
+    stats = StreamingStats.load(sketch_file).to_stats()
+    report_name = report_name or f"relatorio_aproximado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    print(f"   A gerar resumo aproximado ({stats['total_jobs']:,} ofertas): {report_name}")
+    load_plotting()
+    with PdfPages(report_name) as pdf:
+        fig = render_summary_statistics(stats)
+        pdf.savefig(fig, bbox_inches='tight')
+        plt.close(fig)
     
+    print(f"  Relatório gerado com sucesso: {report_name}")
+    return True
+
+def default_data_file(files):
+    """
+    Ficheiro usado sem escolha explícita: o jobs_itjobs*.parquet mais
+    recente (se o pyarrow estiver instalado), senão o CSV mais recente,
+    senão o primeiro encontrado.
+    """
+    import importlib.util
+    candidates = [f for f in files if os.path.basename(f).startswith('jobs_itjobs')]
+    extensions = ['.csv']
+    if importlib.util.find_spec('pyarrow') is not None:
+        extensions.insert(0, '.parquet')
+    for extension in extensions:
+        matching = [f for f in candidates if f.endswith(extension)]
+        if matching:
+            return max(matching, key=os.path.getmtime)
+    return files[0]
+
+def choose_data_file():
+    """
+    Procura ficheiros CSV/Parquet em data/ e na pasta atual. Num terminal
+    com vários ficheiros pergunta qual usar; sem terminal (cron, pipes)
+    usa default_data_file. Retorna None se não houver escolha válida.
+    """
     # Procura por ficheiros CSV na pasta data
     data_folder = "data"
     csv_files = []
     
     if os.path.exists(data_folder):
-        csv_files = [f for f in os.listdir(data_folder) if f.endswith('.csv')]
+        csv_files = [f for f in os.listdir(data_folder) if f.endswith(('.csv', '.parquet'))]
     
     # Também procura na pasta atual
-    current_csv = [f for f in os.listdir('.') if f.endswith('.csv')]
+    current_csv = [f for f in os.listdir('.') if f.endswith(('.csv', '.parquet'))]
     
     all_csv_files = []
     if csv_files:
@@ -344,26 +964,107 @@ def main():
     if not all_csv_files:
         print("Nenhum ficheiro CSV encontrado!")
         print("Certifique-se de que existe um ficheiro .csv na pasta 'data' ou na pasta atual")
-        return
+        return None
+    
+    # Sem terminal ou com um só ficheiro não há pergunta
+    if len(all_csv_files) == 1 or not sys.stdin.isatty():
+        csv_file = default_data_file(all_csv_files)
+        print(f"A usar: {csv_file}")
+        return csv_file
     
     print(f"Ficheiros CSV encontrados:")
     for i, file in enumerate(all_csv_files, 1):
         print(f"  {i}. {file}")
     
-    if len(all_csv_files) == 1:
-        csv_file = all_csv_files[0]
-        print(f"A usar: {csv_file}")
-    else:
+    try:
+        choice = int(input(f"\nEscolha o ficheiro (1-{len(all_csv_files)}): ")) - 1
+        return all_csv_files[choice]
+    except (ValueError, IndexError, EOFError):
+        print("Escolha inválida!")
+        return None
+
+def main(argv=None):
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(description="Gerador de Relatório Estatístico - JobScraper Portugal")
+    arg_parser.add_argument('file', nargs='?', default=None,
+                            help="ficheiro CSV ou Parquet (por defeito: o jobs_itjobs*.parquet mais "
+                                 "recente em data/, ou o CSV; num terminal com vários ficheiros, pergunta)")
+    arg_parser.add_argument('--file', dest='file_option', metavar='FICHEIRO', default=None,
+                            help="o mesmo que o argumento posicional")
+    arg_parser.add_argument('--parallel', action='store_true',
+                            help="renderiza as páginas do PDF em paralelo (requer pypdf)")
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help="número de processos para --parallel (padrão: nº de CPUs)")
+    arg_parser.add_argument('--chunksize', type=int, default=None,
+                            help="agrega o CSV por blocos de N linhas (ficheiros maiores que a memória)")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="recalcula os agregados mesmo que o ficheiro não tenha mudado")
+    arg_parser.add_argument('--export-json', metavar='FICHEIRO',
+                            help="exporta também os agregados em JSON")
+    arg_parser.add_argument('--rollup', action='store_true',
+                            help="guarda o rollup do ficheiro escolhido em data/rollups (sem gerar PDF)")
+    arg_parser.add_argument('--date', default=None,
+                            help="data do crawl para --rollup (AAAA-MM-DD, padrão: data do ficheiro)")
+    arg_parser.add_argument('--trend', action='store_true',
+                            help="gera o relatório de tendências a partir dos rollups")
+    arg_parser.add_argument('--profile', nargs='?', const='stages', choices=['stages', 'sample'],
+                            help="perfis dos agregados e da renderização em data/profiles")
+    arg_parser.add_argument('--since', metavar='AAAA-MM-DD', default=None,
+                            help="só ofertas publicadas a partir desta data (ou p. ex. '30 dias')")
+    arg_parser.add_argument('--approx', metavar='FICHEIRO', nargs='?', const='data/stream_stats.json',
+                            help="gera só o resumo aproximado a partir dos sketches do scraper")
+    args = arg_parser.parse_args(argv)
+    
+    if args.approx:
+        generate_approx_report(args.approx)
+        return
+    
+    since = None
+    if args.since:
+        from core.dates import parse_cutoff
         try:
-            choice = int(input(f"\nEscolha o ficheiro (1-{len(all_csv_files)}): ")) - 1
-            csv_file = all_csv_files[choice]
-        except (ValueError, IndexError):
-            print("Escolha inválida!")
+            since = parse_cutoff(args.since).isoformat()
+        except ValueError as e:
+            print(f"--since: {e}")
             return
+        print(f"Só ofertas publicadas desde {since}")
+    
+    if args.trend:
+        generate_trend_report(since=since)
+        return
+    
+    print("Gerador de Relatório Estatístico - JobScraper Portugal")
+    print("=" * 60)
+    
+    csv_file = args.file_option or args.file
+    if csv_file and not os.path.exists(csv_file):
+        print(f"Ficheiro não encontrado: {csv_file}")
+        return
+    csv_file = csv_file or choose_data_file()
+    if csv_file is None:
+        return
+    
+    analyzer = JobAnalyzer(csv_file, chunksize=args.chunksize, since=since)
+    
+    if args.rollup:
+        analyzer.save_rollup(crawl_date=args.date)
+        return
+    
+    profiler = None
+    if args.profile:
+        from core.profiling import StageProfiler
+        profiler = StageProfiler(os.path.join('data', 'profiles'), mode=args.profile).start()
     
     # Gera o relatório
-    analyzer = JobAnalyzer(csv_file)
-    success = analyzer.generate_report()
+    try:
+        success = analyzer.generate_report(parallel=args.parallel, workers=args.workers,
+                                           use_cache=not args.no_cache, profiler=profiler)
+    finally:
+        if profiler:
+            profiler.stop()
+    
+    if success and args.export_json:
+        analyzer.export_stats_json(args.export_json)
     
     if success:
         print("\nRelatório PDF gerado com sucesso!")
@@ -0,0 +1,68 @@
+"""
+JobScraper-Portugal: linha de comandos única
+
+    python jobscraper.py crawl [--max] [--metrics-port PORTA] [--profile]
+    python jobscraper.py daemon [--pages N] [--min-interval MIN] [--max-interval MIN]
+    python jobscraper.py reclassify
+    python jobscraper.py report [--parallel] [--trend] [--approx] ...
+    python jobscraper.py to-xml [--shards N] ...
+    python jobscraper.py validate [ficheiro.xml] [--xsd jobs_schema.xsd]
+
+Cada subcomando importa só o módulo de que precisa (Selenium, pandas,
+matplotlib e lxml não são carregados pelos restantes), pelo que o
+arranque é rápido em cron e nos processos dos pools. As opções a seguir
+ao subcomando passam para o script correspondente (`-h` mostra-as).
+"""
+import argparse
+import importlib
+import os
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+XML_DIR = os.path.join(SRC_DIR, 'xml_challenge')
+
+# Subcomando -> (módulo com main(argv), argumentos fixos, pasta do módulo, descrição)
+COMMANDS = {
+    'crawl': ('main', [], None,
+              "recolhe as ofertas do itjobs.pt (--max: todas as páginas)"),
+    'daemon': ('daemon_main', [], None,
+               "recolha contínua, revisitando cada página conforme o ritmo de ofertas novas"),
+    'reclassify': ('main', ['--offline'], None,
+                   "volta a extrair e classificar as páginas guardadas no HtmlStore"),
+    'report': ('generate_report', [], None,
+               "gera o relatório PDF, de tendências ou aproximado"),
+    'to-xml': ('csv_to_xml', [], XML_DIR,
+               "converte o CSV para XML (um ficheiro ou shards)"),
+    'validate': ('xml_validator', [], XML_DIR,
+                 "valida um XML contra o Schema XSD"),
+}
+
+def build_parser():
+    arg_parser = argparse.ArgumentParser(
+        prog='jobscraper', description="JobScraper-Portugal",
+        epilog="Use 'jobscraper <comando> -h' para as opções de cada comando.")
+    subparsers = arg_parser.add_subparsers(dest='command', metavar='comando', required=True)
+    for name, (_, _, _, help_text) in COMMANDS.items():
+        # Sem -h próprio: a ajuda é a do script do subcomando
+        subparser = subparsers.add_parser(name, help=help_text, add_help=False)
+        if name == 'crawl':
+            subparser.add_argument('--max', action='store_true',
+                                   help="deteta e percorre todas as páginas (max_main.py)")
+    return arg_parser
+
+def main(argv=None):
+    args, extra = build_parser().parse_known_args(argv)
+    module_name, fixed_args, module_dir, _ = COMMANDS[args.command]
+    if getattr(args, 'max', False):
+        module_name = 'max_main'
+
+    # Os scripts XML estão em xml_challenge; os seus ficheiros por omissão são relativos
+    # a essa pasta e os caminhos indicados pelo utilizador à pasta de trabalho atual
+    if module_dir:
+        sys.path.insert(0, module_dir)
+
+    module = importlib.import_module(module_name)
+    return module.main(fixed_args + extra)
+
+if __name__ == "__main__":
+    main()
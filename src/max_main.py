@@ -1,7 +1,12 @@
-from core import JobScraper, JobParser, save_to_csv
+from core import JobScraper, JobParser, JobDeduplicator, ClusterIndex, save_to_csv, save_to_parquet, save_to_sqlite, HtmlStore, SnapshotIndex, StreamingStats, metrics
+from core import StageProfiler, profile_stage, parse_cutoff, UrlFrontier
+from datetime import timedelta
+from contextlib import nullcontext
+import argparse
 import re
 from bs4 import BeautifulSoup
 
+@metrics.timed("page_discovery")
 def detect_max_pages(scraper):
     
     print("A detectar número máximo de páginas...")
@@ -117,45 +122,116 @@ def detect_max_pages(scraper):
                     print(f"Limite extremo de segurança atingido: {max_pages} páginas")
                     break
         
-        scraper.driver.quit()
+        scraper.release_driver()
         
         print(f"Detecção concluída! Total de páginas encontradas: {max_pages}")
         return max_pages
         
     except Exception as e:
         print(f"Erro na detecção de páginas: {e}")
-        if scraper.driver:
-            scraper.driver.quit()
+        scraper.release_driver()
         return 10
 
-def main():
+def since_arg(value):
+    """Tipo do argumento --since: data limite como `date`."""
+    try:
+        return parse_cutoff(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="JobScraper-Portugal")
+    arg_parser.add_argument('--metrics-port', type=int, default=None,
+                            help="expõe as métricas em direto em http://127.0.0.1:PORTA/metrics")
+    arg_parser.add_argument('--profile', nargs='?', const='stages', choices=['stages', 'sample'],
+                            help="perfis por etapa em data/profiles (cProfile + tracemalloc, "
+                                 "ou 'sample' para amostragem de baixo custo)")
+    arg_parser.add_argument('--fast', action='store_true',
+                            help="classifica pela listagem e só visita as páginas individuais "
+                                 "das ofertas com campos em falta ou pouco fiáveis")
+    arg_parser.add_argument('--min-confidence', type=float, default=0.6,
+                            help="confiança mínima (0-1) dos campos da listagem no modo --fast")
+    arg_parser.add_argument('--detail-budget', type=int, default=None,
+                            help="número máximo de páginas individuais visitadas no modo --fast")
+    arg_parser.add_argument('--since', type=since_arg, default=None,
+                            help="só ofertas publicadas a partir desta data (AAAA-MM-DD ou p. ex. '7 dias'); "
+                                 "a paginação pára quando uma página só tem ofertas anteriores")
+    arg_parser.add_argument('--refresh-hours', type=float, default=24,
+                            help="ofertas visitadas há menos de N horas são relidas do HtmlStore "
+                                 "em vez de descarregadas (por defeito: 24)")
+    args = arg_parser.parse_args(argv)
+
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    profiler = StageProfiler("data/profiles", mode=args.profile) if args.profile else None
+    # Links já vistos (persistem entre runs): ofertas novas primeiro, sem downloads repetidos
+    frontier = UrlFrontier("data/frontier", refresh_after=timedelta(hours=args.refresh_hours))
+    # O HTML bruto fica guardado (comprimido, sem duplicados) para re-extração futura
+    with frontier, HtmlStore("data/html_store") as html_store, profiler or nullcontext():
+        crawl(profiler, fast=args.fast, min_confidence=args.min_confidence,
+              detail_budget=args.detail_budget, since=args.since, frontier=frontier, html_store=html_store)
+
+def crawl(profiler=None, **scraper_options):
     print("Iniciando o JobScraper-Portugal...")
 
     # Inicializa o scraper
-    scraper = JobScraper(base_url="https://www.itjobs.pt/ofertas")
+    scraper = JobScraper(base_url="https://www.itjobs.pt/ofertas", **scraper_options)
 
     # Detecta automaticamente o número máximo de páginas
-    max_pages = detect_max_pages(scraper)
+    with profile_stage(profiler, "page_discovery"):
+        max_pages = detect_max_pages(scraper)
     
     print(f"\nA processar {max_pages} páginas...")
     
     # Faz o download do HTML das páginas de ofertas
-    pages = scraper.get_job_pages(num_pages=max_pages)
+    with profile_stage(profiler, "listing_fetch"):
+        pages = scraper.get_job_pages(num_pages=max_pages)
 
     # Extrai dados completos visitando páginas individuais para melhor precisão
-    print("Modo completo ativado - visitando páginas individuais para melhor precisão...")
-    if max_pages > 50:
+    if scraper.fast:
+        print("Modo rápido ativado - visitando só as páginas individuais com campos pouco fiáveis...")
+    else:
+        print("Modo completo ativado - visitando páginas individuais para melhor precisão...")
+    if max_pages > 50 and not scraper.fast:
         print("AVISO: Com muitas páginas, este processo pode demorar várias horas!")
     
-    raw_jobs = scraper.extract_raw_jobs(pages)
+    # Estatísticas aproximadas (sketches) das ofertas novas, acumuladas entre runs
+    stream_stats = StreamingStats()
+    with profile_stage(profiler, "extract"):
+        raw_jobs = scraper.extract_raw_jobs(pages, on_new_offer=stream_stats.add)
+    stream_stats.accumulate("data/stream_stats.json")
 
     # Analisa e organiza os dados
     parser = JobParser()
-    parsed_jobs = parser.parse_jobs(raw_jobs)
+    with profile_stage(profiler, "parse_jobs"):
+        parsed_jobs = parser.parse_jobs(raw_jobs)
+
+    # Agrupa ofertas quase duplicadas (mesma posição repostada ou em várias cidades),
+    # reaproveitando os clusters dos crawls anteriores guardados junto do histórico
+    with profile_stage(profiler, "dedup"), ClusterIndex("data/jobs_itjobs.db") as cluster_index:
+        parsed_jobs = JobDeduplicator().assign_clusters(parsed_jobs, index=cluster_index)
 
     # Guarda num CSV com nome que inclui o número de páginas
     filename = f"data/jobs_itjobs_max_{max_pages}pages.csv"
-    save_to_csv(parsed_jobs, filename)
+    with profile_stage(profiler, "save"):
+        save_to_csv(parsed_jobs, filename)
+
+        # Versão colunar (Parquet) para relatórios rápidos
+        save_to_parquet(parsed_jobs, filename.replace(".csv", ".parquet"))
+
+        # Atualiza a base de dados histórica (upsert pelo Link)
+        save_to_sqlite(parsed_jobs, "data/jobs_itjobs.db")
+
+        # Snapshot do run e delta face ao run anterior (novas/alteradas/removidas);
+        # com --since o crawl é parcial e as ofertas anteriores passariam a "removidas"
+        if scraper.since is None:
+            SnapshotIndex.for_scope("all", scraper.fast, scraper.detail_budget).record(parsed_jobs)
+            # Rollup do dia para o relatório de tendências (substitui o anterior da mesma data)
+            from generate_report import JobAnalyzer
+            JobAnalyzer(filename).save_rollup()
+        else:
+            print("Snapshot e rollup não registados: crawl limitado por --since")
 
     print("Concluído! Dados guardados em '{}'".format(filename))
     print(f"Estatísticas:")
@@ -171,5 +247,11 @@ def main():
         percentage = count/len(parsed_jobs)*100 if len(parsed_jobs) > 0 else 0
         print(f"   • {field}: {count}/{len(parsed_jobs)} ({percentage:.1f}%)")
 
+    # Tempo e débito por etapa (JSON + formato Prometheus)
+    print("Tempo por etapa:")
+    for line in metrics.summary():
+        print(line)
+    metrics.export("data/metrics")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,90 +1,178 @@
 import pandas as pd
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from lxml import etree
 import os
 import sys
+import argparse
+import csv
+import hashlib
+import io
+import json
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
 
-def clean_xml_text(text):
-    """Limpa texto para ser válido em XML"""
-    if pd.isna(text) or text == "N/A":
-        return ""
-    
-    # Converte para string e limita tamanho se necessário
-    text = str(text).strip()
-    
-    # Remove caracteres problemáticos para XML
-    text = text.replace('&', '&amp;')
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    text = text.replace('"', '&quot;')
-    text = text.replace("'", '&apos;')
-    
-    # Limita descrição se muito longa
-    if len(text) > 500:
-        text = text[:500] + "..."
-    
-    return text
+# Caracteres de controlo proibidos em XML 1.0 (exceto tab, LF e CR). String normal,
+# não raw: os escapes viram os próprios caracteres, aceites tanto por `re` como pelo RE2 do pyarrow
+XML_ILLEGAL_CHARS = "[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]"
+MAX_TEXT_LENGTH = 500
+
+# Caminhos por omissão relativos a esta pasta, qualquer que seja a pasta de trabalho
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), "data")
+
+# Os campos vêm da definição de JobOffer, no pacote core (em src/)
+sys.path.insert(0, os.path.dirname(BASE_DIR))
+from core.offer import XML_FIELDS
+
+def clean_xml_columns(df):
+    """
+    Limpa todas as colunas de um bloco de uma vez (operações vetorizadas):
+    NaN e "N/A" passam a vazio, remove espaços nas pontas e caracteres
+    ilegais em XML e limita o texto a 500 caracteres. O escape de &, < e >
+    fica a cargo do lxml, pelo que é feito uma única vez.
+    """
+    df = df.fillna("").astype(str)
+    for coluna in df.columns:
+        texto = df[coluna].str.strip()
+        texto = texto.mask(texto == "N/A", "")
+        
+        longo = texto.str.len() > MAX_TEXT_LENGTH
+        if longo.any():
+            texto = texto.mask(longo, texto.str.slice(0, MAX_TEXT_LENGTH) + "...")
+        
+        # Só as (raras) células com caracteres ilegais passam pela substituição
+        ilegal = texto.str.contains(XML_ILLEGAL_CHARS, regex=True)
+        if ilegal.any():
+            texto = texto.mask(ilegal, texto[ilegal].str.replace(XML_ILLEGAL_CHARS, "", regex=True))
+        df[coluna] = texto
+    return df
+
+# Elementos de cada <oferta> (ordem do OfertaType no XSD) e colunas do CSV
+CAMPOS = XML_FIELDS
+
+# Indentação dos elementos escritos em stream (2 espaços por nível)
+INDENT_OFERTA = "\n  "
+INDENT_CAMPO = "\n    "
 
-def convert_csv_to_xml(csv_file_path, xml_output_path, max_records=None):    
+def count_csv_records(csv_file_path, chunksize=50_000):
+    """Número de registos do CSV, lendo só a primeira coluna por blocos"""
+    return sum(len(chunk) for chunk in pd.read_csv(csv_file_path, usecols=[0], chunksize=chunksize))
+
+def record_offsets(csv_file_path):
+    """
+    Uma só leitura do CSV em binário: retorna as colunas do cabeçalho e o
+    offset (em bytes) do início de cada registo. Uma quebra de linha só
+    fecha o registo com um número par de aspas acumuladas (as aspas
+    escapadas "" não alteram a paridade), pelo que descrições multilinha
+    entre aspas são seguras.
+    """
+    offsets = array("q")
+    header = b""
+    with open(csv_file_path, "rb") as f:
+        position = 0
+        start = None  # None enquanto se lê o cabeçalho
+        quotes = 0
+        for line in f:
+            if quotes == 0:
+                if start is None and header and not header.count(b'"') % 2:
+                    start = position
+                if start is not None:
+                    offsets.append(position)
+            if start is None:
+                header += line
+            quotes = (quotes + line.count(b'"')) % 2
+            position += len(line)
+    # Linha final em branco não é um registo
+    if offsets and offsets[-1] == position:
+        offsets.pop()
+    names = next(csv.reader(io.StringIO(header.decode("utf-8-sig")))) if header else []
+    return names, offsets
+
+def iter_csv_chunks(csv_file_path, chunksize=10_000, max_records=None, offset=None, names=None):
+    """
+    Blocos do CSV só com as colunas exportadas, parando em max_records.
+    Com `offset` (de record_offsets) e as colunas `names`, a leitura começa
+    nesse byte, sem voltar a ler o que está antes.
+    """
+    colunas = {coluna for _, coluna in CAMPOS}
+    restantes = max_records
+    with open(csv_file_path, "rb") as f:
+        if offset is None:
+            opcoes = {}
+        else:
+            f.seek(offset)
+            opcoes = {"header": None, "names": names}
+        for chunk in pd.read_csv(f, chunksize=chunksize, dtype=str, encoding="utf-8",
+                                 usecols=lambda col: col in colunas, **opcoes):
+            if restantes is not None:
+                chunk = chunk.head(restantes)
+                restantes -= len(chunk)
+            # Colunas em falta no CSV ficam vazias
+            yield chunk.reindex(columns=[coluna for _, coluna in CAMPOS])
+            if restantes is not None and restantes <= 0:
+                break
+
+def build_oferta(oferta_id, valores):
+    """Elemento <oferta> já indentado para escrita em stream"""
+    oferta = etree.Element("oferta", id=str(oferta_id))
+    oferta.text = INDENT_CAMPO
+    elemento = None
+    for (campo_nome, _), campo_valor in zip(CAMPOS, valores):
+        elemento = etree.SubElement(oferta, campo_nome)
+        if campo_valor:
+            elemento.text = campo_valor
+        elemento.tail = INDENT_CAMPO
+    elemento.tail = INDENT_OFERTA
+    return oferta
+
+def write_ofertas_xml(chunks, xml_output_path, total, first_id=1):
+    """
+    Escreve um documento ofertas_emprego diretamente para o disco
+    (lxml.etree.xmlfile), uma <oferta> de cada vez. Retorna o número escrito.
+    """
+    escritos = 0
+    with etree.xmlfile(xml_output_path, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element("ofertas_emprego", total=str(total), fonte="ITJobs.pt",
+                        gerado_por="JobScraper-Portugal"):
+            for chunk in chunks:
+                chunk = clean_xml_columns(chunk)
+                linhas = zip(*(chunk[coluna].tolist() for coluna in chunk.columns))
+                for valores in linhas:
+                    xf.write(INDENT_OFERTA)
+                    xf.write(build_oferta(first_id + escritos, valores))
+                    escritos += 1
+            xf.write("\n")
+    return escritos
+
+def convert_csv_to_xml(csv_file_path, xml_output_path, max_records=None, chunksize=10_000, profiler=None):
+    """
+    Converte o CSV em XML em stream: o CSV é lido por blocos e cada
+    <oferta> é escrita logo no ficheiro, com memória constante.
+    Com `profiler` (StageProfiler), perfila a contagem e a escrita.
+    """
+    stage = profiler.stage if profiler else (lambda name: nullcontext())
     try:
-        # Carrega CSV
         print(f" CSV carregado: {csv_file_path}")
-        df = pd.read_csv(csv_file_path)
+        with stage("count_records"):
+            disponiveis = count_csv_records(csv_file_path)
         
         # Limita número de registos se especificado
-        if max_records is not None and len(df) > max_records:
-            df = df.head(max_records)
-            print(f" Processando primeiros {max_records} registos de {len(pd.read_csv(csv_file_path))}")
+        if max_records is not None and disponiveis > max_records:
+            total = max_records
+            print(f" Processando primeiros {max_records} registos de {disponiveis}")
         else:
-            print(f" Processando todos os {len(df)} registos disponíveis")
-        
-        # Cria elemento raiz
-        root = ET.Element("ofertas_emprego")
-        root.set("total", str(len(df)))
-        root.set("fonte", "ITJobs.pt")
-        root.set("gerado_por", "JobScraper-Portugal")
-        
-        # Processa cada linha do CSV
-        for index, row in df.iterrows():
-            # Elemento para cada oferta
-            oferta = ET.SubElement(root, "oferta")
-            oferta.set("id", str(index + 1))
-            
-            # Adiciona todos os campos do CSV
-            campos = {
-                "titulo": row.get("Título", ""),
-                "empresa": row.get("Empresa", ""),
-                "localizacao": row.get("Localização", ""),
-                "tecnologias": row.get("Tecnologias", ""),
-                "seniority": row.get("Seniority", ""),
-                "categoria": row.get("Categoria", ""),
-                "tipo_contrato": row.get("Tipo de contrato", ""),
-                "modo_trabalho": row.get("Modo de trabalho", ""),
-                "data_publicacao": row.get("Data de publicação", ""),
-                "descricao": row.get("Descrição", ""),
-                "link": row.get("Link", "")
-            }
-            
-            # Adiciona cada campo como elemento XML
-            for campo_nome, campo_valor in campos.items():
-                elemento = ET.SubElement(oferta, campo_nome)
-                elemento.text = clean_xml_text(campo_valor)
-        
-        # Converte para string XML bem formatada
-        rough_string = ET.tostring(root, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ", encoding=None)
-        
-        # Remove linha em branco extra
-        pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
+            total = disponiveis
+            print(f" Processando todos os {total} registos disponíveis")
         
-        # Salva XML
-        with open(xml_output_path, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+        chunks = iter_csv_chunks(csv_file_path, chunksize=chunksize, max_records=max_records)
+        with stage("write_xml"):
+            escritos = write_ofertas_xml(chunks, xml_output_path, total)
         
         print(f" XML criado com sucesso: {xml_output_path}")
-        print(f" Registos processados: {len(df)}")
-        print(f" Campos por registo: {len(campos)}")
+        print(f" Registos processados: {escritos}")
+        print(f" Campos por registo: {len(CAMPOS)}")
         
         return True
         
@@ -92,12 +180,117 @@ def convert_csv_to_xml(csv_file_path, xml_output_path, max_records=None):
         print(f" Erro ao converter CSV para XML: {e}")
         return False
 
-def main():
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 do ficheiro, lido por blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def shard_ranges(total, shards):
+    """Divide [0, total) em `shards` intervalos contíguos [início, fim) de tamanho semelhante"""
+    shards = max(1, min(shards, total)) if total else 1
+    base, extra = divmod(total, shards)
+    ranges = []
+    start = 0
+    for i in range(shards):
+        end = start + base + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def _write_shard(job):
+    """Worker: escreve um shard (documento ofertas_emprego completo) e calcula o checksum"""
+    csv_file_path, shard_path, start, end, offset, names, chunksize = job
+    chunks = iter_csv_chunks(csv_file_path, chunksize=chunksize, max_records=end - start,
+                             offset=offset, names=names)
+    escritos = write_ofertas_xml(chunks, shard_path, end - start, first_id=start + 1)
+    return {
+        "ficheiro": os.path.basename(shard_path),
+        "primeiro_id": start + 1,
+        "ultimo_id": start + escritos,
+        "registos": escritos,
+        "bytes": os.path.getsize(shard_path),
+        "sha256": file_sha256(shard_path),
+    }
+
+def convert_csv_to_xml_sharded(csv_file_path, output_dir, shards=4, workers=None,
+                               max_records=None, chunksize=10_000):
+    """
+    Exporta o CSV em `shards` documentos XML independentes (cada um válido
+    contra jobs_schema.xsd), gerados em paralelo, e escreve manifest.json
+    com os ficheiros, intervalos de ids e checksums SHA-256.
+    Retorna o caminho do manifesto (ou None em caso de erro).
+    """
+    try:
+        print(f" CSV carregado: {csv_file_path}")
+        # Uma só leitura: os workers saltam diretamente para o início do seu shard
+        names, offsets = record_offsets(csv_file_path)
+        total = len(offsets)
+        if max_records is not None:
+            total = min(total, max_records)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        ranges = shard_ranges(total, shards)
+        print(f" A exportar {total} registos em {len(ranges)} shards...")
+        
+        jobs = [(csv_file_path, os.path.join(output_dir, f"ofertas_{i:04d}.xml"), start, end,
+                 offsets[start] if start < end else 0, names, chunksize)
+                for i, (start, end) in enumerate(ranges, 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_info = list(executor.map(_write_shard, jobs))
+        
+        manifest = {
+            "fonte": os.path.basename(csv_file_path),
+            "schema": "jobs_schema.xsd",
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "total": sum(info["registos"] for info in shard_info),
+            "shards": shard_info,
+        }
+        manifest_path = os.path.join(output_dir, "manifest.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        
+        print(f" {len(shard_info)} shards criados em: {output_dir}")
+        print(f" Manifesto: {manifest_path}")
+        return manifest_path
+        
+    except Exception as e:
+        print(f" Erro ao exportar shards XML: {e}")
+        return None
+
+def main(argv=None):
     """Função principal"""
     
+    arg_parser = argparse.ArgumentParser(description="JobScraper-Portugal: CSV to XML Converter")
+    arg_parser.add_argument('--shards', type=int, default=None,
+                            help="divide o XML em N ficheiros gerados em paralelo (com manifest.json)")
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help="número de processos para os shards (por defeito, nº de CPUs)")
+    arg_parser.add_argument('--output-dir', default=os.path.join(BASE_DIR, "shards"),
+                            help="pasta dos shards (por defeito: xml_challenge/shards)")
+    arg_parser.add_argument('--profile', nargs='?', const='stages', choices=['stages', 'sample'],
+                            help="perfis da conversão em ../data/profiles (só o processo principal)")
+    args = arg_parser.parse_args(argv)
+    
+    profiler = None
+    if args.profile:
+        from core.profiling import StageProfiler
+        profiler = StageProfiler(os.path.join(DATA_DIR, "profiles"), mode=args.profile).start()
+    
+    try:
+        convert(args, profiler)
+    finally:
+        if profiler:
+            profiler.stop()
+
+def convert(args, profiler=None):
+    """Executa a conversão pedida na linha de comandos"""
+    
     # Caminhos dos arquivos
-    csv_path = "../data/jobs_itjobs.csv"
-    xml_path = "jobs_sample.xml"
+    csv_path = os.path.join(DATA_DIR, "jobs_itjobs.csv")
+    xml_path = os.path.join(BASE_DIR, "jobs_sample.xml")
     
     print(" JobScraper-Portugal: CSV to XML Converter")
     print("=" * 50)
@@ -108,8 +301,18 @@ def main():
         print(" Execute primeiro o scraper para gerar os dados")
         return
     
+    if args.shards:
+        with profiler.stage("sharded_export") if profiler else nullcontext():
+            manifest_path = convert_csv_to_xml_sharded(csv_path, args.output_dir, shards=args.shards,
+                                                       workers=args.workers)
+        if manifest_path:
+            print("\n Conversão concluída!")
+        else:
+            print("\n Falha na conversão!")
+        return
+    
     # Converte CSV para XML (todos os registos)
-    success = convert_csv_to_xml(csv_path, xml_path, max_records=None)
+    success = convert_csv_to_xml(csv_path, xml_path, max_records=None, profiler=profiler)
     
     if success:
         print("\n Conversão concluída!")
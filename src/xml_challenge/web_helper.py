@@ -1,4 +1,158 @@
+import codecs
+import mmap
 import os
+import struct
+from array import array
+
+# Tamanho dos blocos lidos do ficheiro mapeado
+CHUNK_SIZE = 4 << 20
+# O índice guarda o offset de uma linha em cada INDEX_STEP
+INDEX_STEP = 1024
+# Cabeçalho do índice: magic, tamanho e mtime do ficheiro, passo, nº de quebras de linha
+_INDEX_HEADER = struct.Struct("<4sQqQQ")
+_INDEX_MAGIC = b"LIX1"
+
+class MappedFile:
+    """Ficheiro mapeado em memória só para leitura (ficheiros vazios dão b'')"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.data = b""
+    
+    def __enter__(self):
+        self._file = open(self.path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.data
+    
+    def __exit__(self, exc_type, exc, tb):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+def iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """Blocos (offset, bytes) de tamanho fixo do ficheiro mapeado"""
+    for start in range(0, len(data), chunk_size):
+        yield start, data[start:start + chunk_size]
+
+def count_newlines(path):
+    """Número de quebras de linha, contadas byte a byte por blocos"""
+    with MappedFile(path) as data:
+        return sum(chunk.count(b"\n") for _, chunk in iter_chunks(data))
+
+def scan_encoding(path):
+    """
+    Uma passagem pelo ficheiro: quebras de linha, BOM e validação UTF-8
+    incremental (um bloco de cada vez). Retorna um dict; `erro_utf8` é o
+    offset do primeiro byte inválido, ou None.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    newlines = 0
+    error_offset = None
+    
+    with MappedFile(path) as data:
+        has_bom = data[:3] == b'\xef\xbb\xbf'
+        for start, chunk in iter_chunks(data):
+            newlines += chunk.count(b"\n")
+            if error_offset is None:
+                pending = len(decoder.getstate()[0])
+                try:
+                    decoder.decode(chunk)
+                except UnicodeDecodeError as e:
+                    error_offset = start - pending + e.start
+        if error_offset is None:
+            try:
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError as e:
+                error_offset = len(data) - len(e.object) + e.start
+    
+    return {'quebras': newlines, 'bom': has_bom, 'erro_utf8': error_offset}
+
+class LineIndex:
+    """
+    Índice esparso de linhas guardado em disco (<ficheiro>.lineidx):
+    offsets[k] é o byte onde começa a linha k * step (contando de 0).
+    Fica inválido quando o tamanho ou o mtime do ficheiro mudam.
+    """
+    
+    def __init__(self, path, step, newlines, offsets, size):
+        self.path = path
+        self.step = step
+        self.newlines = newlines
+        self.offsets = offsets
+        self.size = size
+    
+    @staticmethod
+    def index_path(path):
+        return path + ".lineidx"
+    
+    @classmethod
+    def build(cls, path, step=INDEX_STEP):
+        """Constrói o índice numa passagem (quebras localizadas com numpy) e grava-o"""
+        # numpy só é preciso para construir o índice; o resto do módulo não o carrega
+        import numpy as np
+        
+        offsets = array('Q', [0])
+        newlines = 0
+        stat = os.stat(path)
+        
+        with MappedFile(path) as data:
+            for start, chunk in iter_chunks(data):
+                positions = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+                # Número (a contar de 0) da linha que começa a seguir a cada quebra
+                line_numbers = newlines + 1 + np.arange(len(positions))
+                offsets.extend((positions[line_numbers % step == 0] + start + 1).tolist())
+                newlines += len(positions)
+        
+        index_path = cls.index_path(path)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, step, newlines))
+            offsets.tofile(f)
+        os.replace(tmp_path, index_path)
+        return cls(path, step, newlines, offsets, stat.st_size)
+    
+    @classmethod
+    def load(cls, path, step=INDEX_STEP):
+        """Lê o índice do disco, ou reconstrói-o se não existir ou estiver desatualizado"""
+        stat = os.stat(path)
+        index_path = cls.index_path(path)
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) == _INDEX_HEADER.size:
+                    magic, size, mtime_ns, saved_step, newlines = _INDEX_HEADER.unpack(header)
+                    if (magic, size, mtime_ns, saved_step) == (_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, step):
+                        offsets = array('Q')
+                        offsets.frombytes(f.read())
+                        return cls(path, step, newlines, offsets, size)
+        return cls.build(path, step)
+    
+    def line_count(self, data):
+        """Número de linhas como em readlines() (a última pode não ter quebra)"""
+        if not self.size:
+            return 0
+        return self.newlines + (0 if data[-1:] == b"\n" else 1)
+    
+    def read_lines(self, data, first, count):
+        """Linhas first..first+count-1 (a contar de 1) do ficheiro mapeado"""
+        block = (first - 1) // self.step
+        if first < 1 or block >= len(self.offsets):
+            return []
+        pos = self.offsets[block]
+        for _ in range((first - 1) - block * self.step):
+            pos = data.find(b"\n", pos) + 1
+            if pos == 0:
+                return []
+        
+        lines = []
+        while len(lines) < count and pos < len(data):
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = len(data)
+            lines.append(data[pos:end].decode('utf-8', errors='replace').rstrip('\r'))
+            pos = end + 1
+        return lines
 
 def display_file_contents():
     xml_file = "jobs_sample.xml"
@@ -30,8 +184,9 @@ def display_file_contents():
     print("2. Mostrar XSD completo (para copy/paste)")
     print("3. Informações para upload direto")
     print("4. Verificar encoding dos arquivos")
+    print("5. Mostrar intervalo de linhas do XML")
     
-    choice = input("\nEscolha uma opção (1-4): ").strip()
+    choice = input("\nEscolha uma opção (1-5): ").strip()
     
     if choice == "1":
         show_xml_preview(xml_file)
@@ -41,23 +196,39 @@ def display_file_contents():
         show_upload_info(xml_file, xsd_file)
     elif choice == "4":
         check_encoding(xml_file, xsd_file)
+    elif choice == "5":
+        try:
+            first = int(input("Primeira linha: ").strip())
+            count = int(input("Número de linhas (Enter = 20): ").strip() or 20)
+        except ValueError:
+            print(" Número inválido!")
+            return
+        show_xml_preview(xml_file, first=first, count=count)
     else:
         print(" Opção inválida!")
 
-def show_xml_preview(xml_file):
-    """Mostra preview do XML"""
-    print(f"\n Preview do {xml_file} (primeiras 20 linhas):")
+def show_xml_preview(xml_file, first=1, count=20):
+    """Mostra preview do XML (qualquer intervalo de linhas, via índice de linhas)"""
+    if first == 1:
+        print(f"\n Preview do {xml_file} (primeiras {count} linhas):")
+    else:
+        print(f"\n Preview do {xml_file} (linhas {first}-{first + count - 1}):")
     print("-" * 50)
     
-    with open(xml_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        for i, line in enumerate(lines[:20], 1):
-            print(f"{i:2d}: {line.rstrip()}")
+    index = LineIndex.load(xml_file)
+    with MappedFile(xml_file) as data:
+        total = index.line_count(data)
+        lines = index.read_lines(data, first, count)
     
-    if len(lines) > 20:
-        print(f"... (mais {len(lines)-20} linhas)")
+    width = max(2, len(str(first + count - 1)))
+    for i, line in enumerate(lines, first):
+        print(f"{i:{width}d}: {line}")
     
-    print(f"\n Total de linhas: {len(lines)}")
+    remaining = total - (first - 1) - len(lines)
+    if remaining > 0:
+        print(f"... (mais {remaining} linhas)")
+    
+    print(f"\n Total de linhas: {total}")
 
 def show_xsd_content(xsd_file):
     """Mostra XSD completo para copy/paste"""
@@ -98,25 +269,18 @@ def check_encoding(xml_file, xsd_file):
     files = [xml_file, xsd_file]
     
     for file in files:
-        try:
-            # Tenta ler como UTF-8
-            with open(file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Verifica BOM
-            with open(file, 'rb') as f:
-                first_bytes = f.read(3)
-                has_bom = first_bytes == b'\xef\xbb\xbf'
-            
+        # Validação UTF-8 incremental e contagem de linhas numa só passagem
+        info = scan_encoding(file)
+        
+        if info['erro_utf8'] is None:
             print(f" {file}:")
             print(f"   UTF-8 válido")
-            print(f"   BOM: {'Sim' if has_bom else 'Não'}")
-            print(f"   Linhas: {content.count(chr(10)) + 1}")
+            print(f"   BOM: {'Sim' if info['bom'] else 'Não'}")
+            print(f"   Linhas: {info['quebras'] + 1}")
             print()
-            
-        except UnicodeDecodeError:
+        else:
             print(f" {file}:")
-            print(f"    Não é UTF-8 válido")
+            print(f"    Não é UTF-8 válido (byte {info['erro_utf8']:,})")
             print()
 
 if __name__ == "__main__":
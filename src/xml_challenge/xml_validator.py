@@ -1,123 +1,194 @@
 from lxml import etree
+import argparse
 import os
 import sys
 
-def validate_xml_with_xsd(xml_file, xsd_file):
-    try:
-        # Carrega o Schema XSD
+# Schemas compilados por (caminho, mtime): o XSD só é compilado uma vez por processo
+_SCHEMA_CACHE = {}
+
+XS_NS = "http://www.w3.org/2001/XMLSchema"
+
+# Ficheiros por omissão relativos a esta pasta, qualquer que seja a pasta de trabalho
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_schemas(xsd_file):
+    """
+    Retorna (schema, oferta_schema) compilados a partir do XSD, com cache.
+    oferta_schema é o mesmo XSD com um elemento global <oferta> do tipo
+    OfertaType, para validar cada oferta isoladamente.
+    """
+    key = (os.path.abspath(xsd_file), os.path.getmtime(xsd_file))
+    if key not in _SCHEMA_CACHE:
         print(f" Carregando Schema: {xsd_file}")
-        with open(xsd_file, 'rb') as schema_file:
-            schema_doc = etree.parse(schema_file)
-            schema = etree.XMLSchema(schema_doc)
-        
-        # Carrega o arquivo XML
-        print(f" Carregando XML: {xml_file}")
-        with open(xml_file, 'rb') as xml_file_handle:
-            xml_doc = etree.parse(xml_file_handle)
-        
-        # Valida XML contra Schema
-        print(" Validando XML contra Schema...")
-        is_valid = schema.validate(xml_doc)
-        
-        # Coleta erros se existirem
-        errors = []
-        if not is_valid:
-            for error in schema.error_log:
-                errors.append(f"Linha {error.line}: {error.message}")
-        
-        return is_valid, errors
-        
-    except etree.XMLSyntaxError as e:
-        return False, [f"Erro de sintaxe XML: {e}"]
-    except etree.XMLSchemaError as e:
-        return False, [f"Erro no Schema XSD: {e}"]
-    except FileNotFoundError as e:
-        return False, [f"Arquivo não encontrado: {e}"]
-    except Exception as e:
-        return False, [f"Erro inesperado: {e}"]
-
-def validate_xml_syntax(xml_file):    
+        schema_doc = etree.parse(xsd_file)
+        schema = etree.XMLSchema(schema_doc)
+
+        etree.SubElement(schema_doc.getroot(), f"{{{XS_NS}}}element", name="oferta", type="OfertaType")
+        oferta_schema = etree.XMLSchema(schema_doc)
+        _SCHEMA_CACHE[key] = (schema, oferta_schema)
+    return _SCHEMA_CACHE[key]
+
+def _first_error(schema):
+    error = schema.error_log.last_error
+    return error.message if error else "erro desconhecido"
+
+def validate_xml_stream(xml_file, xsd_file, max_errors=50):
+    """
+    Valida o XML numa única leitura em stream (iterparse): os atributos do
+    elemento raiz são validados contra o Schema completo e cada <oferta>
+    contra OfertaType, sendo libertada logo a seguir (memória constante).
+
+    Retorna um dict com a informação do documento, sintaxe_valida,
+    schema_valido, o número de ofertas inválidas e até `max_errors` erros.
+    """
+    result = {
+        'root_tag': None,
+        'attributes': {},
+        'children': 0,
+        'ofertas': 0,
+        'syntax_valid': True,
+        'schema_valid': True,
+        'invalid_records': 0,
+        'errors': [],
+    }
+
+    def add_error(message):
+        result['schema_valid'] = False
+        if len(result['errors']) < max_errors:
+            result['errors'].append(message)
+
     try:
-        print(f" Verificando sintaxe XML: {xml_file}")
-        with open(xml_file, 'r', encoding='utf-8') as f:
-            etree.parse(f)
-        return True, []
-    except etree.XMLSyntaxError as e:
-        return False, [f"Erro de sintaxe: {e}"]
-    except Exception as e:
-        return False, [f"Erro: {e}"]
+        schema, oferta_schema = load_schemas(xsd_file)
+    except (etree.XMLSyntaxError, etree.XMLSchemaParseError) as e:
+        result['schema_valid'] = False
+        result['errors'].append(f"Erro no Schema XSD: {e}")
+        return result
 
-def display_xml_info(xml_file): 
+    print(f" Validando XML em stream: {xml_file}")
+    depth = 0
     try:
-        with open(xml_file, 'r', encoding='utf-8') as f:
-            tree = etree.parse(f)
-            root = tree.getroot()
-        
-        print(f"\n Informações do XML:")
-        print(f"    Elemento raiz: {root.tag}")
-        print(f"    Atributos: {dict(root.attrib)}")
-        print(f"    Elementos filhos: {len(list(root))}")
-        
-        # Conta ofertas se existir
-        ofertas = root.findall('.//oferta')
-        if ofertas:
-            print(f"    Total de ofertas: {len(ofertas)}")
-            
-    except Exception as e:
-        print(f" Erro ao ler XML: {e}")
-
-def main():
-    xml_file = "jobs_sample.xml"
-    xsd_file = "jobs_schema.xsd"
-    
+        for event, elem in etree.iterparse(xml_file, events=('start', 'end'), huge_tree=True):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    result['root_tag'] = elem.tag
+                    result['attributes'] = dict(elem.attrib)
+                    # Raiz sem filhos: valida a tag e os atributos contra o Schema completo
+                    if not schema.validate(etree.Element(elem.tag, elem.attrib)):
+                        add_error(f"Linha {elem.sourceline}: {_first_error(schema)}")
+                continue
+
+            depth -= 1
+            if depth != 1:
+                continue
+
+            result['children'] += 1
+            if elem.tag != 'oferta':
+                add_error(f"Linha {elem.sourceline}: elemento inesperado <{elem.tag}>")
+            else:
+                result['ofertas'] += 1
+                if not oferta_schema.validate(elem):
+                    result['invalid_records'] += 1
+                    add_error(f"Oferta id={elem.get('id')} (linha {elem.sourceline}): "
+                              f"{_first_error(oferta_schema)}")
+
+            # Liberta a oferta processada e as anteriores
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    except etree.XMLSyntaxError as e:
+        result['syntax_valid'] = False
+        result['schema_valid'] = False
+        result['errors'] = [f"Erro de sintaxe: {e}"]
+    except OSError as e:
+        result['syntax_valid'] = False
+        result['schema_valid'] = False
+        result['errors'] = [f"Arquivo não encontrado: {e}"]
+
+    return result
+
+def validate_xml_with_xsd(xml_file, xsd_file):
+    """Valida o XML contra o XSD (numa só leitura). Retorna (válido, erros)."""
+    result = validate_xml_stream(xml_file, xsd_file)
+    return result['schema_valid'], result['errors']
+
+def display_xml_info(result):
+    print(f"\n Informações do XML:")
+    print(f"    Elemento raiz: {result['root_tag']}")
+    print(f"    Atributos: {result['attributes']}")
+    print(f"    Elementos filhos: {result['children']}")
+
+    # Conta ofertas se existir
+    if result['ofertas']:
+        print(f"    Total de ofertas: {result['ofertas']}")
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="JobScraper-Portugal: XML Validator")
+    arg_parser.add_argument('xml_file', nargs='?', default=os.path.join(BASE_DIR, "jobs_sample.xml"),
+                            help="ficheiro XML a validar (por defeito: jobs_sample.xml)")
+    arg_parser.add_argument('--xsd', default=os.path.join(BASE_DIR, "jobs_schema.xsd"),
+                            help="Schema XSD (por defeito: jobs_schema.xsd)")
+    arg_parser.add_argument('--max-errors', type=int, default=50,
+                            help="número máximo de erros a mostrar")
+    args = arg_parser.parse_args(argv)
+    xml_file = args.xml_file
+    xsd_file = args.xsd
+
     print(" JobScraper-Portugal: XML Validator")
     print("=" * 50)
-    
+
     # Verifica se arquivos existem
     if not os.path.exists(xml_file):
         print(f" Arquivo XML não encontrado: {xml_file}")
         return
-    
+
     if not os.path.exists(xsd_file):
         print(f" Arquivo XSD não encontrado: {xsd_file}")
         return
-    
-    # Exibe informações do XML
-    display_xml_info(xml_file)
-    
+
+    # Uma única leitura: sintaxe, informação e Schema
+    result = validate_xml_stream(xml_file, xsd_file, max_errors=args.max_errors)
+    syntax_valid = result['syntax_valid']
+    schema_valid = result['schema_valid']
+
     # Etapa 1: Validação de sintaxe
     print(f"\n Etapa 1: Validação de Sintaxe XML")
     print("-" * 40)
-    syntax_valid, syntax_errors = validate_xml_syntax(xml_file)
-    
+
     if syntax_valid:
         print(" XML bem formado (sintaxe válida)")
+        display_xml_info(result)
     else:
         print(" XML mal formado:")
-        for error in syntax_errors:
+        for error in result['errors']:
             print(f"   • {error}")
         return
-    
+
     # Etapa 2: Validação contra Schema
     print(f"\n Etapa 2: Validação contra Schema XSD")
     print("-" * 40)
-    schema_valid, schema_errors = validate_xml_with_xsd(xml_file, xsd_file)
-    
+
     if schema_valid:
         print(" XML válido contra o Schema!")
         print(" Todos os elementos e tipos estão corretos")
     else:
         print(" XML inválido contra o Schema:")
-        for error in schema_errors:
+        if result['invalid_records']:
+            print(f"   {result['invalid_records']} de {result['ofertas']} ofertas inválidas")
+        for error in result['errors']:
             print(f"   • {error}")
-    
+        hidden = result['invalid_records'] - len(result['errors'])
+        if hidden > 0:
+            print(f"   ... e mais erros (use --max-errors para ver mais)")
+
     # Resumo final
     print(f"\n Resumo da Validação:")
     print(f"    Arquivo XML: {xml_file}")
     print(f"    Schema XSD: {xsd_file}")
     print(f"    Sintaxe válida: {'Sim' if syntax_valid else 'Não'}")
     print(f"    Schema válido: {'Sim' if schema_valid else 'Não'}")
-    
+
     if syntax_valid and schema_valid:
         print(f"\n VALIDAÇÃO CONCLUÍDA COM SUCESSO!")
         print(f"   O XML está completamente válido e em conformidade com o Schema")
@@ -126,4 +197,4 @@ def main():
         print(f"   Corrija os erros antes de prosseguir")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()